@@ -3,6 +3,14 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from .models import db
+from .auth import identity_cache, load_identity, password_hasher
+from .cache import response_cache
+from .compression import response_compression
+from .database import read_replicas
+from .live import live_hub
+from .profiling import request_profiler
+from .serializers import OrjsonProvider, orjson
+from .uploads import image_store
 import os
 
 def create_app(config_object=None):
@@ -15,16 +23,39 @@ def create_app(config_object=None):
     else:
         app.config.from_pyfile('../config.py')
     
+    # Encode JSON with orjson when it is installed
+    if app.config.get('JSON_ORJSON', True) and orjson is not None:
+        app.json = OrjsonProvider(app)
+    
     # Initialize extensions
     db.init_app(app)
+    read_replicas.init_app(app)
     migrate = Migrate(app, db)
     jwt = JWTManager(app)
-    CORS(app)
+    # The client reads the replica stickiness header to send it back
+    CORS(app, expose_headers=[read_replicas.header_name])
+    response_cache.init_app(app)
+    password_hasher.init_app(app)
+    identity_cache.init_app(app)
+    image_store.init_app(app)
+    live_hub.init_app(app)
+    jwt.user_lookup_loader(load_identity)
+    request_profiler.init_app(app)
+    # Registered last so that it runs first among the after_request hooks
+    response_compression.init_app(app)
     
     # Register blueprints
     from .routes import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # Register CLI commands
+    from .standings import standings_cli
+    from .search import search_cli
+    from .sync import sync_cli
+    app.cli.add_command(standings_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(sync_cli)
+    
     # Create a simple route for testing
     @app.route('/')
     def index():
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import jsonify
+from flask_jwt_extended import current_user, jwt_required
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from .executors import thread_pool
+from .models import db, User
+
+
+# Werkzeug's parameters for bare method names, as written into stored hashes
+METHOD_DEFAULTS = {
+    'pbkdf2': f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}',
+    'scrypt': 'scrypt:32768:8:1'
+}
+
+
+def stored_method(method):
+    """The method prefix Werkzeug writes into hashes made with ``method``
+
+    Werkzeug fills in the parameters left out ('pbkdf2:sha256' is stored as
+    'pbkdf2:sha256:600000'), so a configured method is only comparable with
+    stored hashes once completed the same way.
+    """
+    name, *params = method.split(':')
+    if name == 'pbkdf2':
+        hash_name = params[0] if params else 'sha256'
+        iterations = int(params[1]) if len(params) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    return METHOD_DEFAULTS.get(method, method)
+
+
+class HashingBusy(RuntimeError):
+    """Raised when every password hashing slot is taken"""
+
+
+def find_user(username=None, email=None):
+    """User matching ``username`` or ``email``, from one query on the two unique indexes
+
+    A username match wins over an email match, as with the former two
+    sequential lookups.
+    """
+    clauses = []
+    if username:
+        clauses.append(User.username == username)
+    if email:
+        clauses.append(User.email == email)
+    if not clauses:
+        return None
+    users = User.query.filter(or_(*clauses)).limit(2).all()
+    return next((user for user in users if user.username == username), users[0] if users else None)
+
+
+class PasswordHasher:
+    """Password hashing on a bounded thread pool
+
+    hashlib releases the GIL while it derives keys, so PASSWORD_HASH_WORKERS
+    threads cap how many cores login and register bursts can take from
+    request handling. Requests beyond PASSWORD_HASH_MAX_PENDING waiting
+    hashes get HashingBusy (503) instead of queueing without bound.
+
+    PASSWORD_HASH_METHOD is a Werkzeug method string with its work factor,
+    e.g. ``pbkdf2:sha256:600000`` or ``scrypt:32768:8:1``; hashes stored with
+    another method are replaced on the next successful login.
+    """
+
+    def __init__(self, app=None):
+        self.method = METHOD_DEFAULTS['pbkdf2']
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.method = stored_method(method)
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 16)
+        with self._lock:
+            if self._executor is None:
+                self._executor = thread_pool(workers, 'password-hash')
+                self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def _run(self, function, *args):
+        if self._executor is None:
+            return function(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy('Too many concurrent logins, retry shortly')
+        try:
+            return self._executor.submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, user, password):
+        if not password:
+            return False
+        return self._run(check_password_hash, user.password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash uses another method or work factor than configured"""
+        return password_hash.split('$', 1)[0] != self.method
+
+
+# What authorization needs to know about the caller, detached from any session
+Identity = namedtuple('Identity', ['id', 'role'])
+
+
+class IdentityCache:
+    """In-process TTL/LRU cache of user id -> Identity behind the JWT user lookup
+
+    Role checks read current_user from here, so authenticated requests cost
+    no user query once the caller is cached. Committed changes to a User row
+    (role update, delete) evict it in this process; other workers see the
+    change after IDENTITY_CACHE_TTL seconds at most.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.ttl = 30
+        self.max_entries = 1024
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('IDENTITY_CACHE_TTL', self.ttl)
+        self.max_entries = app.config.get('IDENTITY_CACHE_MAX_ENTRIES', self.max_entries)
+        self.clear()
+
+        if not event.contains(Session, 'after_flush', _collect_changed_users):
+            event.listen(Session, 'after_flush', _collect_changed_users)
+            event.listen(Session, 'after_commit', _invalidate_committed_users)
+            event.listen(Session, 'after_rollback', _discard_changed_users)
+
+    def get(self, user_id):
+        """Identity of a user, or None if the user does not exist"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        row = db.session.execute(select(User.id, User.role).where(User.id == user_id)).first()
+        if row is None:
+            return None
+        identity = Identity(*row)
+        with self._lock:
+            self._entries[user_id] = (identity, now + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return identity
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault('changed_users', set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            changed.add(instance.id)
+
+
+def _invalidate_committed_users(session):
+    changed = session.info.pop('changed_users', None)
+    if changed:
+        identity_cache.invalidate(*changed)
+
+
+def _discard_changed_users(session):
+    session.info.pop('changed_users', None)
+
+
+def load_identity(jwt_header, jwt_data):
+    """flask_jwt_extended user_lookup_loader: tokens of deleted users are rejected"""
+    return identity_cache.get(jwt_data['sub'])
+
+
+def role_required(*roles):
+    """jwt_required() restricted to callers whose role is in ``roles``"""
+    def decorator(view):
+        @wraps(view)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if current_user.role not in roles:
+                return jsonify({"error": "Insufficient permissions"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+password_hasher = PasswordHasher()
+identity_cache = IdentityCache()
@@ -0,0 +1,245 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import Response, g, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.datastructures import Headers
+
+from .database import read_replicas
+
+# ``encodings`` holds the body compressed per Content-Encoding, filled on first use (see app.compression)
+CacheEntry = namedtuple('CacheEntry', ['body', 'status', 'headers', 'tags', 'size', 'expires_at', 'encodings'])
+
+
+class NotModified(Response):
+    """304 carrying the validators and Vary of the representation it confirms
+
+    Werkzeug drops Last-Modified from 304s along with the entity headers; it
+    is sent back here so clients validating with If-Modified-Since keep an
+    up-to-date date. Content-Type is only kept for the after_request hooks
+    (compression adds Vary from it); it is removed from the wire.
+    """
+
+    KEPT_HEADERS = ('ETag', 'Last-Modified', 'Vary', 'Cache-Control', 'Expires', 'Content-Location', 'Content-Type')
+
+    def __init__(self, headers):
+        super().__init__(status=304)
+        headers = Headers(headers)
+        for name in self.KEPT_HEADERS:
+            self.headers.setlist(name, headers.getlist(name))
+
+    def get_wsgi_headers(self, environ):
+        headers = super().get_wsgi_headers(environ)
+        if 'Last-Modified' in self.headers:
+            headers['Last-Modified'] = self.headers['Last-Modified']
+        return headers
+
+
+class ResponseCache:
+    """In-process LRU cache of public GET responses
+
+    Entries are keyed on the endpoint, its view arguments and the normalized
+    query string, expire after RESPONSE_CACHE_TTL seconds, and are evicted
+    least-recently-used first once RESPONSE_CACHE_MAX_ENTRIES or
+    RESPONSE_CACHE_MAX_BYTES is reached. Each entry is tagged with the tables
+    its payload was built from; committing a change to one of those tables
+    evicts the matching entries. The cache lives in each worker process, so
+    the TTL bounds how stale other workers can be after a write.
+
+    With read replicas, a client pinned to the primary after a write bypasses
+    the cache, and a response read from a replica is not stored for
+    READ_REPLICA_STICKY_SECONDS after one of its tables was invalidated: the
+    replica may not have the write yet.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_tag = {}
+        self._invalidated_at = {}
+        self._bytes = 0
+        self.enabled = False
+        self.ttl = 60
+        self.max_entries = 1024
+        self.max_bytes = 64 * 1024 * 1024
+        self.replica_lag = 5
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read cache settings and hook invalidation into session commits"""
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', self.ttl)
+        self.max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', self.max_entries)
+        self.max_bytes = app.config.get('RESPONSE_CACHE_MAX_BYTES', self.max_bytes)
+        self.replica_lag = app.config.get('READ_REPLICA_STICKY_SECONDS', self.replica_lag)
+        self.clear()
+
+        if not event.contains(Session, 'after_flush', _collect_changed_tables):
+            event.listen(Session, 'after_flush', _collect_changed_tables)
+            event.listen(Session, 'after_commit', _invalidate_committed_tables)
+            event.listen(Session, 'after_rollback', _discard_changed_tables)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, body, status, headers, tags):
+        size = len(body) + len(key)
+        if size > self.max_bytes:
+            return
+        entry = CacheEntry(body, status, headers, frozenset(tags), size, time.monotonic() + self.ttl, {})
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            self._evict()
+        return entry
+
+    def encoded_body(self, key, entry, encoding, encode):
+        """``entry``'s body compressed with ``encode``, computed once and kept with the entry"""
+        body = entry.encodings.get(encoding)
+        if body is not None:
+            return body
+        body = encode(entry.body)
+        with self._lock:
+            if encoding not in entry.encodings:
+                entry.encodings[encoding] = body
+                # Count the variant only while its entry is cached; _remove subtracts it
+                if self._entries.get(key) is entry:
+                    self._bytes += len(body)
+                    self._evict()
+        return body
+
+    def invalidate(self, *tags):
+        """Evict every entry built from one of the given tables"""
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                self._invalidated_at[tag] = now
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def recently_invalidated(self, tags):
+        """Whether one of ``tags`` was invalidated within the replica lag window"""
+        since = time.monotonic() - self.replica_lag
+        with self._lock:
+            return any(self._invalidated_at.get(tag, since) > since for tag in tags)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._invalidated_at.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size + sum(len(body) for body in entry.encodings.values())
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def cached(self, *tags):
+        """Cache a GET view's response, tagged with the tables it reads"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+                # A client that just wrote must read the primary, not a cached replica read
+                if read_replicas.pinned_to_primary():
+                    response = make_response(view(*args, **kwargs))
+                    response.headers['X-Cache'] = 'BYPASS'
+                    return response
+
+                key = cache_key()
+                entry = self.get(key)
+                if entry is not None:
+                    g.response_cache_entry = (key, entry)
+                    response = Response(entry.body, status=entry.status, headers=entry.headers)
+                    # Stored validators still apply: answer 304 without touching the body
+                    response.make_conditional(request)
+                    if response.status_code == 304:
+                        response = NotModified(entry.headers)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                response = make_response(view(*args, **kwargs))
+                stale_replica = g.get('db_replica') is not None and self.recently_invalidated(tags)
+                if response.status_code == 200 and not response.is_streamed and not stale_replica:
+                    entry = self.set(key, response.get_data(), response.status_code, list(response.headers), tags)
+                    if entry is not None:
+                        g.response_cache_entry = (key, entry)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+
+def cache_key():
+    """Endpoint, view arguments and the sorted query string of the current request"""
+    view_args = sorted((request.view_args or {}).items())
+    query = sorted(request.args.items(multi=True))
+    return f'{request.endpoint}|{view_args}|{query}'
+
+
+def _collect_changed_tables(session, flush_context):
+    tables = session.info.setdefault('cache_tags', set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tables.add(instance.__table__.name)
+
+
+def _invalidate_committed_tables(session):
+    tables = session.info.pop('cache_tags', None)
+    if tables:
+        response_cache.invalidate(*tables)
+
+
+def _discard_changed_tables(session):
+    session.info.pop('cache_tags', None)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,129 @@
+import gzip
+import zlib
+
+from flask import g, request
+
+from .cache import response_cache
+
+try:
+    import brotli
+except ImportError:  # optional: responses are only gzip-compressed
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html', 'text/css',
+    'application/javascript', 'image/svg+xml'
+}
+
+
+class ResponseCompressor:
+    """gzip/brotli compression of API responses, negotiated on Accept-Encoding
+
+    Bodies under COMPRESS_MIN_SIZE bytes are sent as is. Streamed responses
+    (exports) are compressed chunk by chunk, each chunk flushed so the client
+    keeps receiving rows as they are read; Server-Sent Events are left alone.
+    Responses served from the response cache reuse the compressed body stored
+    with their entry, so a hot payload is compressed once per encoding, at
+    the higher COMPRESS_CACHED_* levels, rather than on every request.
+
+    Compressed responses get a weak ETag: the bytes differ per encoding, and
+    If-None-Match compares weakly, so conditional requests still get 304s.
+    """
+
+    def __init__(self, app=None):
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+        self.cached_gzip_level = 9
+        self.cached_brotli_quality = 9
+        self.mimetypes = set(COMPRESSIBLE_MIMETYPES)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('COMPRESS_ENABLED', True):
+            return
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        self.cached_gzip_level = app.config.get('COMPRESS_CACHED_GZIP_LEVEL', self.cached_gzip_level)
+        self.cached_brotli_quality = app.config.get('COMPRESS_CACHED_BROTLI_QUALITY', self.cached_brotli_quality)
+        self.mimetypes = set(app.config.get('COMPRESS_MIMETYPES', self.mimetypes))
+        app.after_request(self._after_request)
+
+    @property
+    def encodings(self):
+        """Supported encodings, preferred first"""
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self):
+        """Encoding with the highest Accept-Encoding quality, or None"""
+        best, best_quality = None, 0
+        for encoding in self.encodings:
+            quality = request.accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body, encoding, cached=False):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.cached_brotli_quality if cached else self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.cached_gzip_level if cached else self.gzip_level, mtime=0)
+
+    def compress_stream(self, chunks, encoding):
+        """Compressed ``chunks`` (bytes), flushed chunk by chunk"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            process, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            process, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+        for chunk in chunks:
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+
+    def _after_request(self, response):
+        # A 304 stands for the compressible 200 it confirms, Vary included
+        if response.status_code == 304 and response.mimetype in self.mimetypes:
+            response.vary.add('Accept-Encoding')
+            return response
+        if (response.status_code != 200 or request.method == 'HEAD' or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or response.mimetype not in self.mimetypes):
+            return response
+
+        # The body depends on Accept-Encoding from here on, compressed or not
+        response.vary.add('Accept-Encoding')
+        if response.cache_control.no_transform:
+            return response
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            # werkzeug only closes response.response: close the original iterable with it
+            original = response.response
+            response.response = self.compress_stream(response.iter_encoded(), encoding)
+            response.call_on_close(getattr(original, 'close', lambda: None))
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            cached = g.get('response_cache_entry')
+            if cached is not None:
+                body = response_cache.encoded_body(*cached, encoding, lambda data: self.compress(data, encoding, True))
+            else:
+                body = self.compress(body, encoding)
+            response.set_data(body)
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+response_compression = ResponseCompressor()
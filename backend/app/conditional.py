@@ -0,0 +1,103 @@
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy import func, select
+from werkzeug.http import is_resource_modified
+
+from .cache import NotModified, cache_key
+from .models import db, Tombstone
+from .sync import TRACKED_TABLES
+
+
+def _related_columns(related):
+    """Scalar subqueries tracking changes to the tables embedded in a payload"""
+    columns = []
+    for model in related:
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        # Deletes leave no updated_at behind: tracked tables have tombstones
+        # (see _deleted_column), the others need a row count
+        if model.__tablename__ not in TRACKED_TABLES:
+            columns.append(select(func.count()).select_from(model).scalar_subquery())
+    return columns
+
+
+def _deleted_column(models):
+    """Latest delete from the tables of ``models``, from their tombstones (see app.sync)
+
+    Deletes advance Last-Modified through it, so If-Modified-Since alone
+    does not get a 304 for a list a row was removed from.
+    """
+    tables = [model.__tablename__ for model in models if model.__tablename__ in TRACKED_TABLES]
+    if not tables:
+        return []
+    return [
+        select(func.max(Tombstone.deleted_at)).where(Tombstone.table_name.in_(tables)).scalar_subquery()
+    ]
+
+
+def _state(values):
+    stamps = [value for value in values if hasattr(value, 'isoformat')]
+    last_modified = max(stamps) if stamps else None
+    return last_modified, '|'.join(str(value) for value in values)
+
+
+def collection_state(query, model, *related):
+    """Validator for a filtered list: max(updated_at) and row count in one query
+
+    ``related`` models are the ones nested in each item; their own max
+    (updated_at) and latest delete are folded in so that, for example,
+    renaming a team changes the validator of the player list.
+    """
+    values = query.order_by(None).with_entities(
+        func.max(model.updated_at),
+        func.count(model.id),
+        *_related_columns(related),
+        *_deleted_column((model, *related))
+    ).one()
+    return _state(values)
+
+
+def entity_state(model, entity_id, *related):
+    """Validator for a single row, or None if it does not exist"""
+    values = db.session.execute(
+        select(model.updated_at, *_related_columns(related), *_deleted_column(related)).where(model.id == entity_id)
+    ).first()
+    if values is None:
+        return None
+    return _state(values)
+
+
+def conditional(validator):
+    """Answer If-None-Match / If-Modified-Since with 304 before running the view
+
+    ``validator`` receives the view arguments and returns (last_modified,
+    fingerprint) from a cheap aggregate query, or None to skip validation.
+    The ETag hashes the fingerprint together with the endpoint and query
+    string, so every representation (?fields=, ?cursor=, ...) has its own.
+    It is weak: the bytes sent differ with the negotiated Content-Encoding.
+    Views are expected to return JSON.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            state = validator(*args, **kwargs)
+            if state is None:
+                return view(*args, **kwargs)
+
+            last_modified, fingerprint = state
+            etag = hashlib.sha1(f'{cache_key()}|{fingerprint}'.encode()).hexdigest()
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = NotModified({'Content-Type': 'application/json'})
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
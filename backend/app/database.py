@@ -0,0 +1,120 @@
+import random
+import time
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, Signer
+
+# SQLALCHEMY_BINDS keys of read replicas (see config.py)
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Requests that only read and may be answered from a replica
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingSession(Session):
+    """Session sending a request's reads to the replica picked by ReplicaRouter
+
+    Flushes (and anything outside a routed request) keep using the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            replica = g.get('db_replica')
+            if replica is not None:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaRouter:
+    """Route GET requests to read replicas, with read-your-writes stickiness
+
+    A request is answered from a random replica when it only reads and the
+    client has not written within READ_REPLICA_STICKY_SECONDS. A successful
+    write returns the end of that window (epoch milliseconds, signed with
+    SECRET_KEY) in the READ_REPLICA_HEADER response header; the client sends
+    it back on its next requests (the Angular app does so in
+    PrimaryReadInterceptor), which pins them to the primary in whichever
+    worker serves them. The header is exposed through CORS; an expired or
+    unsigned value is ignored, so clients cannot pin themselves at will.
+
+    Without replica binds configured nothing is registered.
+    """
+
+    def __init__(self, app=None):
+        self.replicas = []
+        self.sticky_seconds = 5
+        self.header_name = 'X-DB-Primary-Until'
+        self.signer = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.replicas = sorted(key for key in binds if key.startswith(REPLICA_BIND_PREFIX))
+        self.sticky_seconds = app.config.get('READ_REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        self.header_name = app.config.get('READ_REPLICA_HEADER', self.header_name)
+        if not self.replicas:
+            return
+
+        self.signer = Signer(app.secret_key, salt='read-replica-primary-until')
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def pinned_to_primary(self):
+        """Whether the current client wrote within the stickiness window"""
+        if not self.replicas:
+            return False
+        value = request.headers.get(self.header_name)
+        if not value:
+            return False
+        try:
+            until = int(self.signer.unsign(value))
+        except (BadSignature, ValueError):
+            return False
+        return time.time() * 1000 < until
+
+    def _remember_write(self, response):
+        until = int((time.time() + self.sticky_seconds) * 1000)
+        response.headers[self.header_name] = self.signer.sign(str(until)).decode()
+
+    def _before_request(self):
+        if request.method in READ_METHODS and not self.pinned_to_primary():
+            g.db_replica = random.choice(self.replicas)
+
+    def _after_request(self, response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            self._remember_write(response)
+        response.headers['X-DB-Route'] = g.get('db_replica') or 'primary'
+        return response
+
+
+def _pool_state(engine):
+    """Checked-out vs idle connections of one engine's pool"""
+    pool = engine.pool
+    state = {
+        'url': engine.url.render_as_string(hide_password=True),
+        'pool_class': type(pool).__name__,
+        'status': pool.status()
+    }
+    # NullPool / StaticPool keep no counters
+    if hasattr(pool, 'checkedout'):
+        state.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=getattr(pool, '_max_overflow', None),
+            timeout=pool.timeout()
+        )
+    return state
+
+
+def pool_stats():
+    """Pool state of every engine (the primary under 'default', replicas by bind key)"""
+    engines = current_app.extensions['sqlalchemy'].engines
+    return {key or 'default': _pool_state(engine) for key, engine in engines.items()}
+
+
+read_replicas = ReplicaRouter()
@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from gevent import monkey
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+except ImportError:  # optional: only the gevent worker (make run-backend-async) needs it
+    monkey = None
+
+
+def thread_pool(max_workers, thread_name_prefix):
+    """Executor for CPU-bound work (password hashes, image variants)
+
+    Once gevent has monkey-patched threading, ThreadPoolExecutor threads are
+    greenlets: their work would run on the event loop and stall every other
+    connection of the worker. gevent's executor keeps native threads, and
+    waiting on one of its futures only suspends the calling greenlet.
+    """
+    if monkey is not None and monkey.is_module_patched('threading'):
+        return NativeThreadPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from itertools import groupby
+
+from sqlalchemy import select
+
+from .models import db, player_match, Player, Team, Match, StaffMember, News, Partner
+
+# Rows fetched per round-trip and serialized per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+# Exported tables; player_stats is the raw player_match association table
+EXPORT_TABLES = {
+    'players': Player.__table__,
+    'teams': Team.__table__,
+    'matches': Match.__table__,
+    'staff': StaffMember.__table__,
+    'news': News.__table__,
+    'partners': Partner.__table__,
+    'player_stats': player_match
+}
+
+STAT_COLUMNS = [column for column in player_match.c if column.key != 'match_id']
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def _stream(statement):
+    """Iterate a statement through a server-side cursor, EXPORT_BATCH_SIZE rows at a time"""
+    return db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def table_records(table):
+    """Yield every row of ``table`` as a dict, in primary key order"""
+    statement = select(table).order_by(*table.primary_key.columns)
+    for row in _stream(statement):
+        yield dict(row._mapping)
+
+
+def match_records():
+    """Yield every match with its player_match rows nested as player_stats
+
+    A single LEFT JOIN ordered by match id streams the stats right after
+    their match, so grouping consecutive rows never holds more than one
+    match sheet in memory.
+    """
+    match_table = Match.__table__
+    statement = (
+        select(match_table, *[column.label(f'stat_{column.key}') for column in STAT_COLUMNS])
+        .outerjoin(player_match, player_match.c.match_id == match_table.c.id)
+        .order_by(match_table.c.id, player_match.c.player_id)
+    )
+    for _, rows in groupby(_stream(statement), key=lambda row: row.id):
+        record = None
+        for row in rows:
+            mapping = row._mapping
+            if record is None:
+                record = {column.key: mapping[column.key] for column in match_table.columns}
+                record['player_stats'] = []
+            if mapping['stat_player_id'] is not None:
+                stats = {column.key: mapping[f'stat_{column.key}'] for column in STAT_COLUMNS}
+                stats['match_id'] = record['id']
+                record['player_stats'].append(stats)
+        yield record
+
+
+def ndjson_chunks(records):
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, default=_json_default, separators=(',', ':')))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def csv_chunks(columns, records):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    for count, record in enumerate(records, 1):
+        writer.writerow(record)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
+
+def export_chunks(resource, export_format):
+    """Text chunks of a full export; wrap in stream_with_context to send them"""
+    table = EXPORT_TABLES[resource]
+    if export_format == 'csv':
+        # CSV stays flat: match stats are exported separately as player_stats
+        return csv_chunks([column.key for column in table.columns], table_records(table))
+    if resource == 'matches':
+        return ndjson_chunks(match_records())
+    return ndjson_chunks(table_records(table))
@@ -0,0 +1,107 @@
+from functools import lru_cache
+from flask import request
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from .loading import loading_plan
+
+class FieldsetError(ValueError):
+    """Raised when ?fields= or ?include= names a field the schema does not have"""
+
+def _split_arg(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def _nested_schema(field):
+    """Return the nested schema of a Nested or List(Nested) field, else None"""
+    if isinstance(field, fields.List):
+        field = field.inner
+    if isinstance(field, fields.Nested):
+        return field.schema
+    return None
+
+@lru_cache(maxsize=256)
+def _build_schema(schema_class, many, only):
+    return schema_class(many=many, only=only)
+
+def _columns(model, names):
+    """Mapped column attributes of ``model`` for the given field names"""
+    column_attrs = inspect(model).column_attrs
+    return [getattr(model, name) for name in names if name in column_attrs]
+
+def sparse_fieldset(schema, model, relations, required=()):
+    """Narrow ``schema`` and the SQL projection to ``?fields=`` and ``?include=``
+    
+    ``fields`` lists top-level fields, with ``relation.field`` to pick fields of
+    a nested object (``fields=id,last_name,team.name``). ``include`` lists the
+    nested relationships to embed with their default fields. Once either
+    parameter is given, relationships that are not asked for are left out.
+    ``required`` columns are always loaded (e.g. the pagination sort keys).
+    
+    Returns the schema to dump with and the query options to load with.
+    """
+    requested = _split_arg('fields')
+    includes = _split_arg('include')
+    if requested == []:
+        raise FieldsetError('fields must name at least one field')
+    
+    if requested is None and includes is None:
+        return schema, loading_plan(model, relations)
+    
+    dump_fields = schema.dump_fields
+    nested = {name: _nested_schema(field) for name, field in dump_fields.items()}
+    nested = {name: nested_schema for name, nested_schema in nested.items() if nested_schema is not None}
+    
+    # Split "relation.field" selections from top-level names
+    top_level = []
+    subfields = {}
+    for name in requested if requested is not None else [n for n in dump_fields if n not in nested]:
+        relation, _, subfield = name.partition('.')
+        if subfield:
+            subfields.setdefault(relation, []).append(subfield)
+        else:
+            top_level.append(name)
+    includes = includes or []
+    
+    unknown = set(top_level + list(subfields) + includes) - set(dump_fields)
+    if unknown:
+        raise FieldsetError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    not_nested = set(list(subfields) + includes) - set(nested)
+    if not_nested:
+        raise FieldsetError(f"Cannot include non-nested fields: {', '.join(sorted(not_nested))}")
+    for relation, names in subfields.items():
+        unknown = set(names) - set(nested[relation].dump_fields)
+        if unknown:
+            raise FieldsetError(f"Unknown fields for {relation}: {', '.join(sorted(unknown))}")
+    
+    embedded = [name for name in nested if name in top_level or name in subfields or name in includes]
+    
+    # Build the dump-side "only", keeping the schema's declared field order
+    only = [name for name in dump_fields if name in top_level and name not in nested]
+    for relation in embedded:
+        if relation in subfields:
+            only.extend(f'{relation}.{subfield}' for subfield in subfields[relation])
+        else:
+            only.append(relation)
+    narrowed = _build_schema(type(schema), schema.many, tuple(only))
+    
+    # Build the load-side projection to match
+    mapper = inspect(model)
+    columns = _columns(model, only) + list(required)
+    if not columns:
+        columns = [getattr(model, column.key) for column in mapper.primary_key]
+    options = [load_only(*columns)]
+    for relation in embedded:
+        if relation not in relations:
+            continue
+        target = mapper.relationships[relation].mapper.class_
+        nested_names = subfields.get(relation) or list(nested[relation].dump_fields)
+        loader = relations[relation](getattr(model, relation))
+        nested_columns = _columns(target, nested_names)
+        if nested_columns:
+            loader = loader.load_only(*nested_columns)
+        options.append(loader)
+    
+    return narrowed, tuple(options)
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from .models import db, Match, News, Partner, Standing
+from .news import excerpt
+from .schemas import MatchSchema, PartnerSchema, standings_schema
+
+# Display order of the partner groups; other levels follow, alphabetically
+PARTNERSHIP_LEVELS = ('platinum', 'gold', 'silver', 'bronze')
+
+TEAM_SUMMARY = ('id', 'name', 'logo_url')
+home_matches_schema = MatchSchema(many=True, only=(
+    'id', 'date', 'home_team_id', 'away_team_id', 'home_score', 'away_score', 'venue', 'match_type', 'season',
+    'status', *(f'home_team.{name}' for name in TEAM_SUMMARY), *(f'away_team.{name}' for name in TEAM_SUMMARY)
+))
+home_partners_schema = PartnerSchema(many=True, only=('id', 'name', 'logo_url', 'website_url', 'partnership_level'))
+
+
+def latest_news(count, excerpt_length):
+    # The stored excerpt, shortened if needed: content never leaves the database
+    statement = (
+        select(News.id, News.title, News.image_url, News.published_date, News.category, News.excerpt)
+        .order_by(News.published_date.desc(), News.id.desc())
+        .limit(count)
+    )
+    return [
+        {
+            'id': row.id,
+            'title': row.title,
+            'image_url': row.image_url,
+            'published_date': row.published_date and row.published_date.isoformat(),
+            'category': row.category,
+            'excerpt': excerpt(row.excerpt, excerpt_length)
+        }
+        for row in db.session.execute(statement)
+    ]
+
+
+def _matches(*criteria, order_by, limit):
+    query = Match.query.options(joinedload(Match.home_team), joinedload(Match.away_team))
+    return query.filter(*criteria).order_by(*order_by).limit(limit).all()
+
+
+def top_standings(count):
+    """First rows of the latest season's table, in the GET /standings order"""
+    latest_season = select(func.max(Standing.season)).scalar_subquery()
+    return (
+        Standing.query.options(joinedload(Standing.team))
+        .filter(Standing.season == latest_season)
+        .order_by(
+            Standing.points.desc(),
+            (Standing.goals_for - Standing.goals_against).desc(),
+            Standing.goals_for.desc(),
+            Standing.team_id
+        )
+        .limit(count)
+        .all()
+    )
+
+
+def partners_by_level():
+    partners = home_partners_schema.dump(Partner.query.order_by(Partner.name, Partner.id).all())
+    groups = {}
+    for partner in partners:
+        groups.setdefault(partner['partnership_level'] or 'other', []).append(partner)
+    ranked = sorted(groups, key=lambda level: (
+        PARTNERSHIP_LEVELS.index(level) if level in PARTNERSHIP_LEVELS else len(PARTNERSHIP_LEVELS), level
+    ))
+    return [{'level': level, 'partners': groups[level]} for level in ranked]
+
+
+def home_payload():
+    """Everything the homepage shows, in five queries whatever the data size"""
+    config = current_app.config
+    standings = top_standings(config.get('HOME_STANDINGS_COUNT', 5))
+    next_fixture = _matches(Match.status == 'upcoming', Match.date >= datetime.utcnow(),
+                            order_by=(Match.date, Match.id), limit=1)
+
+    return {
+        'news': latest_news(config.get('HOME_NEWS_COUNT', 3), config.get('HOME_EXCERPT_LENGTH', 200)),
+        'next_fixture': home_matches_schema.dump(next_fixture)[0] if next_fixture else None,
+        'last_results': home_matches_schema.dump(_matches(
+            Match.status == 'played', order_by=(Match.date.desc(), Match.id.desc()),
+            limit=config.get('HOME_RESULTS_COUNT', 3)
+        )),
+        'standings': {
+            'season': standings[0].season if standings else None,
+            'top': standings_schema.dump(standings)
+        },
+        'partners': partners_by_level()
+    }
@@ -0,0 +1,154 @@
+import queue
+import threading
+from itertools import count
+
+from flask import current_app
+
+
+class TooManySubscribers(RuntimeError):
+    """Raised when a worker already serves LIVE_MAX_SUBSCRIBERS streams"""
+
+
+# Queued in place of a frame to end a subscriber's stream
+CLOSE = object()
+
+
+class Subscription:
+    """One client's bounded queue of encoded SSE frames"""
+
+    def __init__(self, hub, match_id, size):
+        self.hub = hub
+        self.match_id = match_id
+        self.frames = queue.Queue(maxsize=size)
+
+    def put(self, frame):
+        # A client that stops reading loses its oldest frames, never the latest score
+        while True:
+            try:
+                self.frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def stream(self, first_frames):
+        """SSE body: the given frames, then published frames and heartbeats until closed"""
+        try:
+            yield f'retry: {self.hub.retry_ms}\n\n'.encode()
+            yield from first_frames
+            while True:
+                try:
+                    frame = self.frames.get(timeout=self.hub.heartbeat)
+                except queue.Empty:
+                    # A comment line keeps proxies from closing the idle connection
+                    # and lets the server notice clients that went away
+                    yield b': keep-alive\n\n'
+                    continue
+                if frame is CLOSE:
+                    return
+                yield frame
+        finally:
+            self.hub.unsubscribe(self)
+
+
+class LiveHub:
+    """In-process publish/subscribe hub behind the /matches/<id>/live SSE streams
+
+    A write publishes an event once: it is encoded to a single SSE frame that
+    is queued for every subscriber of the match, so a score change reaches
+    all connected fans without any per-client query. The last published
+    match state is kept while a match has subscribers and sent to new ones.
+
+    Each stream holds a worker thread (or greenlet) for as long as the client
+    stays connected, so a worker accepts at most LIVE_MAX_SUBSCRIBERS of them.
+    The hub only sees writes made in its own process: serve the API from one
+    gevent worker (``make run-backend-async``) so every fan shares one hub.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._latest = {}
+        self._ids = count(1)
+        self.max_subscribers = 1000
+        self.heartbeat = 15
+        self.queue_size = 16
+        self.retry_ms = 3000
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_subscribers = app.config.get('LIVE_MAX_SUBSCRIBERS', self.max_subscribers)
+        self.heartbeat = app.config.get('LIVE_HEARTBEAT_SECONDS', self.heartbeat)
+        self.queue_size = app.config.get('LIVE_QUEUE_SIZE', self.queue_size)
+        self.retry_ms = app.config.get('LIVE_RETRY_MS', self.retry_ms)
+
+    def subscriber_count(self, match_id=None):
+        with self._lock:
+            if match_id is not None:
+                return len(self._subscriptions.get(match_id, ()))
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, match_id):
+        subscription = Subscription(self, match_id, self.queue_size)
+        with self._lock:
+            total = sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+            if total >= self.max_subscribers:
+                raise TooManySubscribers('Too many live subscribers, retry shortly')
+            self._subscriptions.setdefault(match_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.match_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.match_id]
+                self._latest.pop(subscription.match_id, None)
+
+    def latest(self, match_id):
+        """Last frame published for a match with subscribers, or None"""
+        with self._lock:
+            return self._latest.get(match_id)
+
+    def first_frame(self, match_id, load):
+        """Frame a new subscriber starts from: the latest one, or ``load()`` (one query) encoded
+
+        A frame built here is kept for the next subscribers, unless a newer
+        one was published meanwhile.
+        """
+        frame = self.latest(match_id)
+        if frame is None:
+            frame = self.encode('match', load())
+            with self._lock:
+                if match_id in self._subscriptions:
+                    frame = self._latest.setdefault(match_id, frame)
+        return frame
+
+    def encode(self, event, payload):
+        """One SSE frame, encoded with the app's JSON provider"""
+        data = current_app.json.dumps(payload)
+        return f'id: {next(self._ids)}\nevent: {event}\ndata: {data}\n\n'.encode()
+
+    def publish(self, match_id, event, payload, close=False):
+        """Send an event to every subscriber of a match; ``close`` then ends their streams"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(match_id, ()))
+            if not subscriptions:
+                return 0
+        frame = self.encode(event, payload)
+        with self._lock:
+            if event == 'match' and match_id in self._subscriptions:
+                self._latest[match_id] = frame
+        for subscription in subscriptions:
+            subscription.put(frame)
+            if close:
+                subscription.put(CLOSE)
+        return len(subscriptions)
+
+
+live_hub = LiveHub()
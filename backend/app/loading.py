@@ -0,0 +1,28 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+# Loader strategy for each nested relationship a schema serializes, so a dump
+# never falls back to per-row lazy loads.
+
+# PlayerSchema.team (TeamSchema without players)
+PLAYER_RELATIONS = {'team': joinedload}
+
+# TeamSchema.players (PlayerSchema without team); selectinload keeps the
+# team page LIMIT on team rows instead of on the joined roster rows
+TEAM_RELATIONS = {'players': selectinload}
+
+# MatchSchema.home_team / away_team (TeamSchema without players)
+MATCH_RELATIONS = {'home_team': joinedload, 'away_team': joinedload}
+
+# StandingSchema.team (id, name and logo only)
+STANDING_RELATIONS = {'team': joinedload}
+
+# NewsSchema.author (UserSchema id and username only)
+NEWS_RELATIONS = {'author': joinedload}
+
+def loading_plan(model, relations, names=None):
+    """Build the loader options for ``relations`` (or only the ``names`` subset)"""
+    return tuple(
+        strategy(getattr(model, name))
+        for name, strategy in relations.items()
+        if names is None or name in names
+    )
@@ -1,8 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from .database import RoutingSession
 
-db = SQLAlchemy()
+# GET requests may read from a replica (see app.database.ReplicaRouter)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Association tables for many-to-many relationships
 player_match = db.Table('player_match',
@@ -12,7 +14,9 @@ player_match = db.Table('player_match',
     db.Column('assists', db.Integer, default=0),
     db.Column('yellow_cards', db.Integer, default=0),
     db.Column('red_cards', db.Integer, default=0),
-    db.Column('minutes_played', db.Integer, default=0)
+    db.Column('minutes_played', db.Integer, default=0),
+    # The primary key serves lookups by player; stats by match need their own index
+    db.Index('ix_player_match_match_id', 'match_id')
 )
 
 class User(db.Model):
@@ -23,7 +27,7 @@ class User(db.Model):
     password_hash = db.Column(db.String(256), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='user')  # admin, coach, player, user
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -50,12 +54,18 @@ class Player(db.Model):
     team_id = db.Column(db.Integer, db.ForeignKey('team.id'))
     category = db.Column(db.String(20))  # Seniors, U19, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     team = db.relationship('Team', back_populates='players')
     matches = db.relationship('Match', secondary=player_match, back_populates='players')
     
+    # Indexes for the filters used by GET /players (pages are keyed on id)
+    __table_args__ = (
+        db.Index('ix_player_team_id_category', team_id, category),
+        db.Index('ix_player_category_id', category, id),
+    )
+    
     def __repr__(self):
         return f'<Player {self.first_name} {self.last_name}>'
 
@@ -68,7 +78,7 @@ class Team(db.Model):
     home_stadium = db.Column(db.String(100))
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     players = db.relationship('Player', back_populates='team')
@@ -92,16 +102,51 @@ class Match(db.Model):
     status = db.Column(db.String(20), default='upcoming')  # upcoming, played, cancelled
     summary = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     home_team = db.relationship('Team', foreign_keys=[home_team_id], back_populates='home_matches')
     away_team = db.relationship('Team', foreign_keys=[away_team_id], back_populates='away_matches')
     players = db.relationship('Player', secondary=player_match, back_populates='matches')
     
+    # Indexes for the filters used by GET /matches (pages are keyed on date, id)
+    __table_args__ = (
+        db.Index('ix_match_season_status_date', season, status, date, id),
+        db.Index('ix_match_status_date', status, date, id),
+        db.Index('ix_match_date', date, id),
+        db.Index('ix_match_home_team_id_date', home_team_id, date),
+        db.Index('ix_match_away_team_id_date', away_team_id, date),
+    )
+    
     def __repr__(self):
         return f'<Match {self.home_team.name} vs {self.away_team.name} on {self.date}>'
 
+class Standing(db.Model):
+    """Standing model: one team's league table row for a season, kept up to date on match writes"""
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.String(20), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
+    played = db.Column(db.Integer, nullable=False, default=0)
+    won = db.Column(db.Integer, nullable=False, default=0)
+    drawn = db.Column(db.Integer, nullable=False, default=0)
+    lost = db.Column(db.Integer, nullable=False, default=0)
+    goals_for = db.Column(db.Integer, nullable=False, default=0)
+    goals_against = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    form = db.Column(db.String(5), nullable=False, default='')  # last results, newest first (e.g. "WDLWW")
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    team = db.relationship('Team')
+    
+    __table_args__ = (
+        db.UniqueConstraint('season', 'team_id', name='uq_standing_season_team_id'),
+    )
+    
+    def __repr__(self):
+        return f'<Standing {self.season} team={self.team_id} pts={self.points}>'
+
 class StaffMember(db.Model):
     """StaffMember model representing a staff member (coach, medical, etc.)"""
     id = db.Column(db.Integer, primary_key=True)
@@ -112,7 +157,12 @@ class StaffMember(db.Model):
     bio = db.Column(db.Text)
     start_date = db.Column(db.Date)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    # Index for the role filter used by GET /staff
+    __table_args__ = (
+        db.Index('ix_staff_member_role_id', role, id),
+    )
     
     def __repr__(self):
         return f'<StaffMember {self.first_name} {self.last_name} - {self.role}>'
@@ -122,16 +172,26 @@ class News(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
+    # Computed from content on every write (see app.news.summarize)
+    excerpt = db.Column(db.String(300))
+    word_count = db.Column(db.Integer)
+    reading_time = db.Column(db.Integer)  # minutes
     image_url = db.Column(db.String(255))
     published_date = db.Column(db.DateTime, default=datetime.utcnow)
     category = db.Column(db.String(50))  # match report, club news, announcement, etc.
     author_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     author = db.relationship('User')
     
+    # Indexes for GET /news (pages are keyed on published_date DESC, id DESC)
+    __table_args__ = (
+        db.Index('ix_news_category_published_date', category, published_date.desc(), id.desc()),
+        db.Index('ix_news_published_date', published_date.desc(), id.desc()),
+    )
+    
     def __repr__(self):
         return f'<News {self.title}>'
 
@@ -144,7 +204,22 @@ class Partner(db.Model):
     description = db.Column(db.Text)
     partnership_level = db.Column(db.String(50))  # platinum, gold, silver, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f'<Partner {self.name}>'
+
+class Tombstone(db.Model):
+    """Tombstone model: a deleted row, kept so that delta sync clients can drop it (see app.sync)"""
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Index for the deletes of one table since a watermark
+    __table_args__ = (
+        db.Index('ix_tombstone_table_name_deleted_at', table_name, deleted_at),
+    )
     
     def __repr__(self):
-        return f'<Partner {self.name}>'
\ No newline at end of file
+        return f'<Tombstone {self.table_name} {self.row_id}>'
@@ -0,0 +1,26 @@
+import math
+
+# Summary stored with each news item at write time, so that lists and the
+# homepage never read the content column
+NEWS_EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+NEWS_SUMMARY_FIELDS = ('excerpt', 'word_count', 'reading_time')
+
+
+def excerpt(text, length):
+    """First ``length`` characters of ``text``, cut at a word boundary"""
+    text = ' '.join((text or '').split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0]
+    return cut.rstrip('.,;:!?') + '…'
+
+
+def summarize(content):
+    """Excerpt, word count and reading time (minutes, at least one) of a news body"""
+    word_count = len((content or '').split())
+    return {
+        'excerpt': excerpt(content, NEWS_EXCERPT_LENGTH),
+        'word_count': word_count,
+        'reading_time': max(1, math.ceil(word_count / WORDS_PER_MINUTE))
+    }
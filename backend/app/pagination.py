@@ -0,0 +1,160 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import date, datetime
+
+from flask import current_app, request
+from sqlalchemy import and_, false, or_, tuple_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+
+class PaginationError(ValueError):
+    """Raised when the client sends an invalid cursor or limit"""
+
+
+class Page(namedtuple('Page', ['items', 'next_cursor', 'limit'])):
+    """One page of a keyset-paginated query"""
+
+    def dump(self, schema):
+        """Serialize the page with a many=True schema"""
+        return {
+            'items': schema.dump(self.items),
+            'next_cursor': self.next_cursor,
+            'limit': self.limit
+        }
+
+
+def _sort_key(expression):
+    """Split an order_by expression into (column, descending)"""
+    if isinstance(expression, UnaryExpression) and expression.modifier is operators.desc_op:
+        return expression.element, True
+    if isinstance(expression, UnaryExpression) and expression.modifier is operators.asc_op:
+        return expression.element, False
+    return expression, False
+
+
+def sort_columns(*order_by):
+    """Columns behind order_by expressions, e.g. to select them in a projection"""
+    return [_sort_key(expression)[0] for expression in order_by]
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(keys, row):
+    """Build an opaque cursor pointing just after ``row``"""
+    values = [_encode_value(getattr(row, column.key)) for column, _ in keys]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, keys):
+    """Decode a cursor produced by encode_cursor for the same sort keys"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError('cursor does not match this listing')
+        return [_decode_value(column, value) for (column, _), value in zip(keys, values)]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise PaginationError('Invalid cursor')
+
+
+def _nullable(column):
+    return getattr(column, 'nullable', False)
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _step(column, descending, value, nulls_first):
+    """Rows strictly after ``value`` on one sort column"""
+    if value is None:
+        return column.is_not(None) if nulls_first else false()
+    step = column < value if descending else column > value
+    if _nullable(column) and not nulls_first:
+        step = or_(step, column.is_(None))
+    return step
+
+
+def _after(keys, values, nulls_high=False):
+    """Filter clause selecting the rows strictly after the cursor position
+
+    NULL never compares equal or unequal, so nullable sort columns get
+    explicit IS NULL branches, matching where the database sorts NULLs:
+    above every value on PostgreSQL (``nulls_high``), below on SQLite.
+    """
+    directions = {descending for _, descending in keys}
+    first, _ = keys[0]
+    if len(directions) == 1 and None not in values and not any(_nullable(column) for column, _ in keys[1:]):
+        # Row-value comparison lets the database walk a composite index directly
+        descending = directions.pop()
+        columns = tuple_(*[column for column, _ in keys])
+        after = columns < tuple_(*values) if descending else columns > tuple_(*values)
+        if _nullable(first) and descending != nulls_high:
+            after = or_(after, first.is_(None))
+        return after
+
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [_equal(keys[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*equal, _step(column, descending, values[i], descending == nulls_high)))
+    return or_(*clauses)
+
+
+def page_limit():
+    """Read ``limit`` from the query string, capped by PAGINATION_MAX_LIMIT"""
+    default = current_app.config.get('PAGINATION_DEFAULT_LIMIT', 50)
+    maximum = current_app.config.get('PAGINATION_MAX_LIMIT', 200)
+    limit = request.args.get('limit', default)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise PaginationError('limit must be an integer')
+    if limit < 1:
+        raise PaginationError('limit must be positive')
+    return min(limit, maximum)
+
+
+def paginate(query, *order_by):
+    """Fetch one page of ``query`` ordered by ``order_by``
+
+    The last order_by expression must be unique (usually the primary key) so
+    that every row has a stable position. The cursor encodes the sort values of
+    the last returned row, so fetching any page costs the same index seek no
+    matter how deep the client has scrolled.
+    """
+    keys = [_sort_key(expression) for expression in order_by]
+    limit = page_limit()
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        nulls_high = query.session.get_bind().dialect.name == 'postgresql'
+        query = query.filter(_after(keys, decode_cursor(cursor, keys), nulls_high))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(keys, rows[-1])
+
+    return Page(rows, next_cursor, limit)
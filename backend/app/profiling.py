@@ -0,0 +1,223 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import wraps
+
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from .auth import role_required
+from .models import db
+
+# Upper bounds (seconds) of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestProfile:
+    """Timings collected while one request is handled"""
+    __slots__ = ('start', 'sql_count', 'sql_time', 'lazy_count', 'statements',
+                 'dump_time', 'dump_depth', 'json_time')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        # Statements run while a schema is dumping are lazy loads
+        self.lazy_count = 0
+        self.statements = []
+        self.dump_time = 0.0
+        self.dump_depth = 0
+        self.json_time = 0.0
+
+
+def _current_profile():
+    if has_request_context():
+        return g.get('profile')
+    return None
+
+
+def _profiling_provider(provider_class):
+    """Subclass of the app's JSON provider that charges encoding time to the current request"""
+
+    class ProfilingJSONProvider(provider_class):
+        def dumps(self, obj, **kwargs):
+            profile = _current_profile()
+            if profile is None:
+                return super().dumps(obj, **kwargs)
+            start = time.perf_counter()
+            try:
+                return super().dumps(obj, **kwargs)
+            finally:
+                profile.json_time += time.perf_counter() - start
+
+    return ProfilingJSONProvider
+
+
+def profiled_dump(dump):
+    """Decorate a serializer's dump() to charge its time to the current request
+
+    Used by the API schemas and the compiled serializers; with profiling
+    disabled it only costs a flag check.
+    """
+    @wraps(dump)
+    def wrapper(self, *args, **kwargs):
+        profile = _current_profile() if request_profiler.enabled else None
+        if profile is None:
+            return dump(self, *args, **kwargs)
+        # Nested schemas dump inside their parent: only time the outermost call
+        profile.dump_depth += 1
+        start = time.perf_counter()
+        try:
+            return dump(self, *args, **kwargs)
+        finally:
+            profile.dump_depth -= 1
+            if profile.dump_depth == 0:
+                profile.dump_time += time.perf_counter() - start
+    return wrapper
+
+
+class RequestProfiler:
+    """Opt-in per-request instrumentation (PROFILING_ENABLED)
+
+    Records SQL statement count and time through engine events, Marshmallow
+    dump and JSON encoding time, and response size. Each response gets a
+    Server-Timing header, requests slower than PROFILING_SLOW_REQUEST_MS are
+    logged with their slowest statements, and aggregated counters are served
+    in Prometheus text format at PROFILING_METRICS_PATH (admins only).
+
+    When disabled nothing is registered, so requests pay no overhead.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.slow_request_ms = 500
+        self.slow_statements = 10
+        self.server_timing = True
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PROFILING_ENABLED', False)
+        if not self.enabled:
+            return
+
+        self.slow_request_ms = app.config.get('PROFILING_SLOW_REQUEST_MS', 500)
+        self.slow_statements = app.config.get('PROFILING_SLOW_STATEMENTS', 10)
+        self.server_timing = app.config.get('PROFILING_SERVER_TIMING', True)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.json = _profiling_provider(type(app.json))(app)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule(app.config.get('PROFILING_METRICS_PATH', '/metrics'),
+                         'profiling_metrics', role_required('admin')(self.metrics_view))
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if _current_profile() is not None:
+            conn.info.setdefault('profiling_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile()
+        if profile is None or not conn.info.get('profiling_start'):
+            return
+        duration = time.perf_counter() - conn.info['profiling_start'].pop()
+        profile.sql_count += 1
+        profile.sql_time += duration
+        if profile.dump_depth:
+            profile.lazy_count += 1
+        profile.statements.append((duration, statement))
+
+    def _before_request(self):
+        g.profile = RequestProfile()
+
+    def _after_request(self, response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+
+        total = time.perf_counter() - profile.start
+        # Streamed bodies are still to be generated, their size is unknown here
+        size = response.content_length
+        if size is None and not response.is_streamed:
+            size = len(response.get_data())
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+
+        if self.server_timing:
+            response.headers['Server-Timing'] = ', '.join([
+                f'db;dur={profile.sql_time * 1000:.2f};desc="{profile.sql_count} queries, {profile.lazy_count} lazy"',
+                f'dump;dur={profile.dump_time * 1000:.2f}',
+                f'json;dur={profile.json_time * 1000:.2f}',
+                f'total;dur={total * 1000:.2f}'
+            ])
+
+        self._record(request.method, endpoint, response.status_code, total, profile, size or 0)
+
+        if self.slow_request_ms and total * 1000 >= self.slow_request_ms:
+            slowest = sorted(profile.statements, key=lambda item: item[0], reverse=True)[:self.slow_statements]
+            current_app.logger.warning(
+                'Slow request %s %s -> %s in %.1f ms (%d queries / %.1f ms, %d lazy, dump %.1f ms, json %.1f ms, %s bytes)\n%s',
+                request.method, request.full_path, response.status_code, total * 1000,
+                profile.sql_count, profile.sql_time * 1000, profile.lazy_count,
+                profile.dump_time * 1000, profile.json_time * 1000, size,
+                '\n'.join(f'  {duration * 1000:8.1f} ms  {" ".join(statement.split())}' for duration, statement in slowest)
+            )
+        return response
+
+    def _record(self, method, endpoint, status, total, profile, size):
+        labels = f'method="{method}",endpoint="{endpoint}"'
+        with self._lock:
+            self._counters[('http_requests_total', f'{labels},status="{status}"')] += 1
+            self._counters[('http_response_size_bytes_total', labels)] += size
+            self._counters[('db_queries_total', labels)] += profile.sql_count
+            self._counters[('db_lazy_loads_total', labels)] += profile.lazy_count
+            self._counters[('db_query_duration_seconds_total', labels)] += profile.sql_time
+            self._counters[('serialization_duration_seconds_total', f'{labels},stage="dump"')] += profile.dump_time
+            self._counters[('serialization_duration_seconds_total', f'{labels},stage="json"')] += profile.json_time
+            buckets = self._histograms[labels]
+            buckets[bisect_left(DURATION_BUCKETS, total)] += 1
+            self._counters[('http_request_duration_seconds_sum', labels)] += total
+
+    def metrics(self):
+        """Aggregated counters in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((labels, list(buckets)) for labels, buckets in self._histograms.items())
+
+        seen = set()
+        for (name, labels), value in counters:
+            if name == 'http_request_duration_seconds_sum':
+                continue
+            if name not in seen:
+                seen.add(name)
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name}{{{labels}}} {value:g}')
+
+        if histograms:
+            lines.append('# TYPE http_request_duration_seconds histogram')
+        sums = {labels: value for (name, labels), value in counters if name == 'http_request_duration_seconds_sum'}
+        for labels, buckets in histograms:
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            cumulative += buckets[-1]
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {sums.get(labels, 0):g}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return Response(self.metrics(), mimetype='text/plain; version=0.0.4')
+
+
+request_profiler = RequestProfiler()
@@ -1,20 +1,80 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, abort, redirect, request, jsonify, current_app, send_file, stream_with_context
+from marshmallow import ValidationError
+from sqlalchemy.orm import defer
 from flask_jwt_extended import jwt_required, create_access_token, get_jwt_identity
 from datetime import datetime, timedelta
-from .models import db, User, Player, Team, Match, StaffMember, News, Partner
+import time
+from .models import db, User, Player, Team, Match, Standing, StaffMember, News, Partner
+from .pagination import PaginationError, paginate, sort_columns
+from .fieldsets import FieldsetError, sparse_fieldset
+from .auth import HashingBusy, find_user, password_hasher, role_required
+from .cache import response_cache
+from .database import pool_stats
+from .serializers import compiled_serializer
+from .conditional import conditional, collection_state, entity_state
+from .export import EXPORT_FORMATS, EXPORT_TABLES, export_chunks
+from .uploads import UploadError, image_store
+from .search import SEARCH_TYPES, search_page
+from .live import TooManySubscribers, live_hub
+from .sync import SYNC_RESOURCES, parse_watermark, sync_page
+from .home import home_payload
+from .news import NEWS_SUMMARY_FIELDS, summarize
+from .stats import (
+    LEADERBOARD_STATS, player_season_totals, team_season_totals, leaderboard,
+    match_player_stats, upsert_match_stats
+)
+from .standings import match_result, update_standings
+from .loading import PLAYER_RELATIONS, TEAM_RELATIONS, MATCH_RELATIONS, STANDING_RELATIONS, NEWS_RELATIONS, loading_plan
 from .schemas import (
     user_schema, users_schema,
     player_schema, players_schema,
     team_schema, teams_schema,
-    match_schema, matches_schema,
+    match_schema, matches_schema, match_sheet_schema,
+    standings_schema,
     staff_member_schema, staff_members_schema,
-    news_schema, news_items_schema,
+    news_schema, news_summaries_schema,
     partner_schema, partners_schema
 )
 
 # Create Blueprint
 api_bp = Blueprint('api', __name__)
 
+@api_bp.errorhandler(PaginationError)
+@api_bp.errorhandler(FieldsetError)
+def handle_query_error(error):
+    """Reject malformed cursors, limits and fieldsets"""
+    return jsonify({"error": str(error)}), 400
+
+@api_bp.errorhandler(UploadError)
+def handle_upload_error(error):
+    """Reject uploads that are not an accepted image"""
+    return jsonify({"error": str(error)}), error.status
+
+@api_bp.errorhandler(HashingBusy)
+def handle_hashing_busy(error):
+    """Shed login and register bursts instead of queueing them"""
+    return jsonify({"error": str(error)}), 503, {'Retry-After': '1'}
+
+@api_bp.errorhandler(TooManySubscribers)
+def handle_too_many_subscribers(error):
+    """Refuse live streams beyond the per-worker cap"""
+    return jsonify({"error": str(error)}), 503, {'Retry-After': '5'}
+
+def render_page(query, schema, options, model, *order_by):
+    """Paginate ``query`` and serialize the page with ``schema``
+    
+    When the schema compiles (see app.serializers), the page is fetched as row
+    tuples of just the serialized columns and dumped by the compiled
+    serializer; otherwise the ORM objects are loaded with ``options`` and
+    dumped by Marshmallow. Both produce the same payload.
+    """
+    serializer = current_app.config.get('FAST_SERIALIZATION', True) and compiled_serializer(schema, model)
+    if not serializer:
+        return jsonify(paginate(query.options(*options), *order_by).dump(schema))
+    
+    page = paginate(serializer.project(query, *sort_columns(*order_by)), *order_by)
+    return jsonify(page.dump(serializer))
+
 # Authentication routes
 @api_bp.route('/auth/register', methods=['POST'])
 def register():
@@ -27,16 +87,17 @@ def register():
         return jsonify({"errors": errors}), 400
     
     # Check if user already exists
-    if User.query.filter_by(username=data['username']).first() or User.query.filter_by(email=data['email']).first():
+    if find_user(data['username'], data['email']):
         return jsonify({"error": "Username or email already exists"}), 409
     
     # Create new user
     user = User(
         username=data['username'],
         email=data['email'],
-        role=data.get('role', 'user')
+        # self-registration never grants a role; admins are promoted server-side
+        role='user'
     )
-    user.set_password(data['password'])
+    user.password_hash = password_hasher.hash(data['password'])
     
     db.session.add(user)
     db.session.commit()
@@ -56,12 +117,17 @@ def login():
     data = request.get_json()
     
     # Find user by username or email
-    user = User.query.filter_by(username=data.get('username')).first() or User.query.filter_by(email=data.get('email')).first()
+    user = find_user(data.get('username'), data.get('email'))
     
     # Check if user exists and password is correct
-    if not user or not user.check_password(data.get('password')):
+    if not user or not password_hasher.verify(user, data.get('password')):
         return jsonify({"error": "Invalid credentials"}), 401
     
+    # Upgrade the stored hash when the configured work factor changed
+    if password_hasher.needs_rehash(user.password_hash):
+        user.password_hash = password_hasher.hash(data['password'])
+        db.session.commit()
+    
     # Create access token
     access_token = create_access_token(identity=user.id)
     
@@ -71,10 +137,23 @@ def login():
         "access_token": access_token
     }), 200
 
+# Cache routes
+@api_bp.route('/cache/stats', methods=['GET'])
+@role_required('admin')
+def get_cache_stats():
+    """Get response cache hit/miss counters"""
+    return jsonify(response_cache.stats()), 200
+
+# Database routes
+@api_bp.route('/db/pool', methods=['GET'])
+@role_required('admin')
+def get_pool_stats():
+    """Get checked-out and idle connections of the database pools"""
+    return jsonify(pool_stats()), 200
+
 # Player routes
-@api_bp.route('/players', methods=['GET'])
-def get_players():
-    """Get all players"""
+def filtered_players():
+    """Player query with the GET /players filters applied"""
     # Get query parameters for filtering
     category = request.args.get('category')
     team_id = request.args.get('team_id')
@@ -88,16 +167,27 @@ def get_players():
     if team_id:
         query = query.filter_by(team_id=team_id)
     
-    # Execute query
-    players = query.all()
+    return query
+
+@api_bp.route('/players', methods=['GET'])
+@response_cache.cached('player', 'team')
+@conditional(lambda: collection_state(filtered_players(), Player, Team))
+def get_players():
+    """Get a page of players"""
+    # Narrow the filtered query to ?fields= / ?include=
+    schema, options = sparse_fieldset(players_schema, Player, PLAYER_RELATIONS)
     
-    return jsonify(players_schema.dump(players)), 200
+    # Execute query
+    return render_page(filtered_players(), schema, options, Player, Player.id), 200
 
 @api_bp.route('/players/<int:player_id>', methods=['GET'])
+@response_cache.cached('player', 'team')
+@conditional(lambda player_id: entity_state(Player, player_id, Team))
 def get_player(player_id):
     """Get a specific player by ID"""
-    player = Player.query.get_or_404(player_id)
-    return jsonify(player_schema.dump(player)), 200
+    schema, options = sparse_fieldset(player_schema, Player, PLAYER_RELATIONS)
+    player = Player.query.options(*options).get_or_404(player_id)
+    return jsonify(schema.dump(player)), 200
 
 @api_bp.route('/players', methods=['POST'])
 @jwt_required()
@@ -153,16 +243,22 @@ def delete_player(player_id):
 
 # Team routes
 @api_bp.route('/teams', methods=['GET'])
+@response_cache.cached('team', 'player')
+@conditional(lambda: collection_state(Team.query, Team, Player))
 def get_teams():
-    """Get all teams"""
-    teams = Team.query.all()
-    return jsonify(teams_schema.dump(teams)), 200
+    """Get a page of teams"""
+    schema, options = sparse_fieldset(teams_schema, Team, TEAM_RELATIONS)
+    page = paginate(Team.query.options(*options), Team.id)
+    return jsonify(page.dump(schema)), 200
 
 @api_bp.route('/teams/<int:team_id>', methods=['GET'])
+@response_cache.cached('team', 'player')
+@conditional(lambda team_id: entity_state(Team, team_id, Player))
 def get_team(team_id):
     """Get a specific team by ID"""
-    team = Team.query.get_or_404(team_id)
-    return jsonify(team_schema.dump(team)), 200
+    schema, options = sparse_fieldset(team_schema, Team, TEAM_RELATIONS)
+    team = Team.query.options(*options).get_or_404(team_id)
+    return jsonify(schema.dump(team)), 200
 
 @api_bp.route('/teams', methods=['POST'])
 @jwt_required()
@@ -217,9 +313,8 @@ def delete_team(team_id):
     return jsonify({"message": "Team deleted successfully"}), 200
 
 # Match routes
-@api_bp.route('/matches', methods=['GET'])
-def get_matches():
-    """Get all matches"""
+def filtered_matches():
+    """Match query with the GET /matches filters applied"""
     # Get query parameters for filtering
     status = request.args.get('status')
     season = request.args.get('season')
@@ -236,19 +331,49 @@ def get_matches():
     if team_id:
         query = query.filter((Match.home_team_id == team_id) | (Match.away_team_id == team_id))
     
-    # Sort by date (upcoming matches first)
-    query = query.order_by(Match.date)
-    
-    # Execute query
-    matches = query.all()
+    return query
+
+@api_bp.route('/matches', methods=['GET'])
+@response_cache.cached('match', 'team')
+@conditional(lambda: collection_state(filtered_matches(), Match, Team))
+def get_matches():
+    """Get a page of matches"""
+    # Narrow the filtered query to ?fields= / ?include=
+    schema, options = sparse_fieldset(matches_schema, Match, MATCH_RELATIONS, required=(Match.date,))
     
-    return jsonify(matches_schema.dump(matches)), 200
+    # Execute query, sorted by date (upcoming matches first)
+    return render_page(filtered_matches(), schema, options, Match, Match.date, Match.id), 200
 
 @api_bp.route('/matches/<int:match_id>', methods=['GET'])
+@response_cache.cached('match', 'team', 'player_match')
+@conditional(lambda match_id: entity_state(Match, match_id, Team))
 def get_match(match_id):
     """Get a specific match by ID"""
-    match = Match.query.get_or_404(match_id)
-    return jsonify(match_schema.dump(match)), 200
+    schema, options = sparse_fieldset(match_schema, Match, MATCH_RELATIONS)
+    match = Match.query.options(*options).get_or_404(match_id)
+    
+    # Attach the match sheet in one query when the schema will serialize it
+    if 'player_stats' in schema.dump_fields:
+        match.player_stats = match_player_stats(match_id)
+    
+    return jsonify(schema.dump(match)), 200
+
+@api_bp.route('/matches/<int:match_id>/live', methods=['GET'])
+def stream_match(match_id):
+    """Stream score, status and match sheet changes as Server-Sent Events"""
+    # Subscribe before reading the current state, so no change can fall in between
+    subscription = live_hub.subscribe(match_id)
+    try:
+        first_frame = live_hub.first_frame(match_id, lambda: match_schema.dump(Match.query.get_or_404(match_id)))
+    except Exception:
+        live_hub.unsubscribe(subscription)
+        raise
+    
+    # The stream itself runs no query: the request's connection goes back to the pool
+    response = Response(subscription.stream([first_frame]), mimetype='text/event-stream',
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(lambda: live_hub.unsubscribe(subscription))
+    return response
 
 @api_bp.route('/matches', methods=['POST'])
 @jwt_required()
@@ -265,6 +390,7 @@ def create_match():
     match = Match(**data)
     
     db.session.add(match)
+    update_standings(None, match_result(match))
     db.session.commit()
     
     return jsonify({
@@ -278,17 +404,24 @@ def update_match(match_id):
     """Update a match"""
     match = Match.query.get_or_404(match_id)
     data = request.get_json()
+    previous_result = match_result(match)
     
     # Update match attributes
     for key, value in data.items():
         if hasattr(match, key):
             setattr(match, key, value)
     
+    # Apply the score/status change to the standings in the same transaction
+    update_standings(previous_result, match_result(match))
     db.session.commit()
     
+    # Push the new state to the live streams of this match
+    payload = match_schema.dump(match)
+    live_hub.publish(match_id, 'match', payload)
+    
     return jsonify({
         "message": "Match updated successfully",
-        "match": match_schema.dump(match)
+        "match": payload
     }), 200
 
 @api_bp.route('/matches/<int:match_id>', methods=['DELETE'])
@@ -296,16 +429,142 @@ def update_match(match_id):
 def delete_match(match_id):
     """Delete a match"""
     match = Match.query.get_or_404(match_id)
+    previous_result = match_result(match)
     
     db.session.delete(match)
+    update_standings(previous_result, None)
     db.session.commit()
+    live_hub.publish(match_id, 'deleted', {"id": match_id}, close=True)
     
     return jsonify({"message": "Match deleted successfully"}), 200
 
+@api_bp.route('/matches/<int:match_id>/stats', methods=['POST'])
+@jwt_required()
+def save_match_stats(match_id):
+    """Save a full match sheet of player stats in one upsert"""
+    started = time.perf_counter()
+    match = Match.query.get_or_404(match_id)
+    data = request.get_json()
+    
+    # Validate data
+    if not isinstance(data, list):
+        return jsonify({"error": "Expected a list of player stats"}), 400
+    try:
+        rows = match_sheet_schema.load(data)
+    except ValidationError as err:
+        return jsonify({"errors": err.messages}), 400
+    
+    # Check the sheet refers to this match and to known players, once each
+    player_ids = [row['player_id'] for row in rows]
+    if any(row.get('match_id', match_id) != match_id for row in rows):
+        return jsonify({"error": "match_id does not match the URL"}), 400
+    if len(set(player_ids)) != len(player_ids):
+        return jsonify({"error": "Duplicate player_id in match sheet"}), 400
+    known_ids = set(db.session.scalars(db.select(Player.id).where(Player.id.in_(player_ids))))
+    unknown_ids = sorted(set(player_ids) - known_ids)
+    if unknown_ids:
+        return jsonify({"error": "Unknown players", "player_ids": unknown_ids}), 400
+    validated = time.perf_counter()
+    
+    # Write every row in one statement and touch the match so its validators change
+    upsert_match_stats(match_id, rows)
+    match.updated_at = datetime.utcnow()
+    db.session.commit()
+    response_cache.invalidate('player_match')
+    written = time.perf_counter()
+    
+    # Read the sheet back once for all live subscribers (none: no query)
+    if live_hub.subscriber_count(match_id):
+        live_hub.publish(match_id, 'stats', {
+            "match_id": match_id,
+            "player_stats": match_sheet_schema.dump(match_player_stats(match_id))
+        })
+    
+    return jsonify({
+        "message": "Match stats saved successfully",
+        "match_id": match_id,
+        "rows": len(rows),
+        "timings_ms": {
+            "validate": round((validated - started) * 1000, 2),
+            "write": round((written - validated) * 1000, 2),
+            "total": round((written - started) * 1000, 2)
+        }
+    }), 200
+
+# Standings routes
+@api_bp.route('/standings', methods=['GET'])
+@response_cache.cached('standing', 'team')
+def get_standings():
+    """Get the league table for a season (latest season by default)"""
+    season = request.args.get('season') or db.session.query(db.func.max(Standing.season)).scalar()
+    
+    # Base query
+    query = Standing.query.options(*loading_plan(Standing, STANDING_RELATIONS)).filter_by(season=season)
+    
+    # Sort by points, then goal difference, then goals scored
+    query = query.order_by(
+        Standing.points.desc(),
+        (Standing.goals_for - Standing.goals_against).desc(),
+        Standing.goals_for.desc(),
+        Standing.team_id
+    )
+    
+    # Execute query
+    standings = query.all()
+    
+    return jsonify({
+        "season": season,
+        "standings": standings_schema.dump(standings)
+    }), 200
+
+# Statistics routes
+@api_bp.route('/players/<int:player_id>/stats', methods=['GET'])
+@response_cache.cached('player', 'match', 'player_match')
+def get_player_stats(player_id):
+    """Get a player's totals and per-90 rates for each season"""
+    Player.query.get_or_404(player_id)
+    season = request.args.get('season')
+    
+    return jsonify({
+        "player_id": player_id,
+        "seasons": player_season_totals(player_id, season)
+    }), 200
+
+@api_bp.route('/teams/<int:team_id>/stats', methods=['GET'])
+@response_cache.cached('team', 'player', 'match', 'player_match')
+def get_team_stats(team_id):
+    """Get a team's player totals for each season"""
+    Team.query.get_or_404(team_id)
+    season = request.args.get('season')
+    
+    return jsonify({
+        "team_id": team_id,
+        "seasons": team_season_totals(team_id, season)
+    }), 200
+
+@api_bp.route('/stats/leaders', methods=['GET'])
+@response_cache.cached('player', 'match', 'player_match')
+def get_leaders():
+    """Get the top players for a stat (top scorers by default)"""
+    stat = request.args.get('stat', 'goals')
+    season = request.args.get('season')
+    limit = request.args.get('limit', 10, type=int)
+    
+    # Validate query parameters
+    if stat not in LEADERBOARD_STATS:
+        return jsonify({"error": f"stat must be one of: {', '.join(LEADERBOARD_STATS)}"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+    
+    return jsonify({
+        "stat": stat,
+        "season": season,
+        "leaders": leaderboard(stat, season, limit)
+    }), 200
+
 # Staff routes
-@api_bp.route('/staff', methods=['GET'])
-def get_staff_members():
-    """Get all staff members"""
+def filtered_staff_members():
+    """StaffMember query with the GET /staff filters applied"""
     # Get query parameters for filtering
     role = request.args.get('role')
     
@@ -316,16 +575,27 @@ def get_staff_members():
     if role:
         query = query.filter_by(role=role)
     
-    # Execute query
-    staff_members = query.all()
+    return query
+
+@api_bp.route('/staff', methods=['GET'])
+@response_cache.cached('staff_member')
+@conditional(lambda: collection_state(filtered_staff_members(), StaffMember))
+def get_staff_members():
+    """Get a page of staff members"""
+    # Narrow the filtered query to ?fields=
+    schema, options = sparse_fieldset(staff_members_schema, StaffMember, {})
     
-    return jsonify(staff_members_schema.dump(staff_members)), 200
+    # Execute query
+    return render_page(filtered_staff_members(), schema, options, StaffMember, StaffMember.id), 200
 
 @api_bp.route('/staff/<int:staff_id>', methods=['GET'])
+@response_cache.cached('staff_member')
+@conditional(lambda staff_id: entity_state(StaffMember, staff_id))
 def get_staff_member(staff_id):
     """Get a specific staff member by ID"""
-    staff_member = StaffMember.query.get_or_404(staff_id)
-    return jsonify(staff_member_schema.dump(staff_member)), 200
+    schema, options = sparse_fieldset(staff_member_schema, StaffMember, {})
+    staff_member = StaffMember.query.options(*options).get_or_404(staff_id)
+    return jsonify(schema.dump(staff_member)), 200
 
 @api_bp.route('/staff', methods=['POST'])
 @jwt_required()
@@ -380,9 +650,8 @@ def delete_staff_member(staff_id):
     return jsonify({"message": "Staff member deleted successfully"}), 200
 
 # News routes
-@api_bp.route('/news', methods=['GET'])
-def get_news_items():
-    """Get all news items"""
+def filtered_news_items():
+    """News query with the GET /news filters applied"""
     # Get query parameters for filtering
     category = request.args.get('category')
     
@@ -393,19 +662,29 @@ def get_news_items():
     if category:
         query = query.filter_by(category=category)
     
-    # Sort by published date (newest first)
-    query = query.order_by(News.published_date.desc())
-    
-    # Execute query
-    news_items = query.all()
+    return query
+
+@api_bp.route('/news', methods=['GET'])
+@response_cache.cached('news', 'user')
+@conditional(lambda: collection_state(filtered_news_items(), News, User))
+def get_news_items():
+    """Get a page of news item summaries"""
+    # Narrow the filtered query to ?fields= / ?include=
+    schema, options = sparse_fieldset(news_summaries_schema, News, NEWS_RELATIONS, required=(News.published_date,))
+    # The summary schema has no content: never load the column
+    options = (defer(News.content), *options)
     
-    return jsonify(news_items_schema.dump(news_items)), 200
+    # Execute query, sorted by published date (newest first)
+    return render_page(filtered_news_items(), schema, options, News, News.published_date.desc(), News.id.desc()), 200
 
 @api_bp.route('/news/<int:news_id>', methods=['GET'])
+@response_cache.cached('news', 'user')
+@conditional(lambda news_id: entity_state(News, news_id, User))
 def get_news_item(news_id):
     """Get a specific news item by ID"""
-    news_item = News.query.get_or_404(news_id)
-    return jsonify(news_schema.dump(news_item)), 200
+    schema, options = sparse_fieldset(news_schema, News, NEWS_RELATIONS)
+    news_item = News.query.options(*options).get_or_404(news_id)
+    return jsonify(schema.dump(news_item)), 200
 
 @api_bp.route('/news', methods=['POST'])
 @jwt_required()
@@ -422,8 +701,8 @@ def create_news_item():
     if 'author_id' not in data:
         data['author_id'] = get_jwt_identity()
     
-    # Create new news item
-    news_item = News(**data)
+    # Create new news item, with its summary computed once here
+    news_item = News(**data, **summarize(data['content']))
     
     db.session.add(news_item)
     db.session.commit()
@@ -440,9 +719,13 @@ def update_news_item(news_id):
     news_item = News.query.get_or_404(news_id)
     data = request.get_json()
     
-    # Update news item attributes
+    # Update news item attributes (the summary is derived, never set directly)
     for key, value in data.items():
-        if hasattr(news_item, key):
+        if hasattr(news_item, key) and key not in NEWS_SUMMARY_FIELDS:
+            setattr(news_item, key, value)
+    
+    if 'content' in data:
+        for key, value in summarize(news_item.content).items():
             setattr(news_item, key, value)
     
     db.session.commit()
@@ -465,16 +748,21 @@ def delete_news_item(news_id):
 
 # Partner routes
 @api_bp.route('/partners', methods=['GET'])
+@response_cache.cached('partner')
+@conditional(lambda: collection_state(Partner.query, Partner))
 def get_partners():
-    """Get all partners"""
-    partners = Partner.query.all()
-    return jsonify(partners_schema.dump(partners)), 200
+    """Get a page of partners"""
+    schema, options = sparse_fieldset(partners_schema, Partner, {})
+    return render_page(Partner.query, schema, options, Partner, Partner.id), 200
 
 @api_bp.route('/partners/<int:partner_id>', methods=['GET'])
+@response_cache.cached('partner')
+@conditional(lambda partner_id: entity_state(Partner, partner_id))
 def get_partner(partner_id):
     """Get a specific partner by ID"""
-    partner = Partner.query.get_or_404(partner_id)
-    return jsonify(partner_schema.dump(partner)), 200
+    schema, options = sparse_fieldset(partner_schema, Partner, {})
+    partner = Partner.query.options(*options).get_or_404(partner_id)
+    return jsonify(schema.dump(partner)), 200
 
 @api_bp.route('/partners', methods=['POST'])
 @jwt_required()
@@ -526,4 +814,99 @@ def delete_partner(partner_id):
     db.session.delete(partner)
     db.session.commit()
     
-    return jsonify({"message": "Partner deleted successfully"}), 200
\ No newline at end of file
+    return jsonify({"message": "Partner deleted successfully"}), 200
+
+# Export routes
+@api_bp.route('/export/<resource>', methods=['GET'])
+@jwt_required()
+def export_resource(resource):
+    """Stream every row of a resource as NDJSON or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+    
+    if resource not in EXPORT_TABLES:
+        return jsonify({"error": f"Unknown export resource: {resource}"}), 404
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown export format: {export_format}"}), 400
+    
+    # Rows are fetched and encoded batch by batch while the response is sent
+    return Response(
+        stream_with_context(export_chunks(resource, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename={resource}.{export_format}"}
+    )
+
+# Home routes
+@api_bp.route('/home', methods=['GET'])
+@response_cache.cached('news', 'match', 'team', 'standing', 'partner')
+def get_home():
+    """Get the homepage sections (news, fixtures, standings, partners) in one response"""
+    return jsonify(home_payload()), 200
+
+# Sync routes
+@api_bp.route('/sync/<resource>', methods=['GET'])
+def sync_resource(resource):
+    """Get the rows of a resource changed since a watermark, and the ids deleted since"""
+    since = request.args.get('since')
+    
+    if resource not in SYNC_RESOURCES:
+        return jsonify({"error": f"Unknown sync resource: {resource}"}), 404
+    
+    return jsonify(sync_page(resource, since and parse_watermark(since), request.args.get('cursor'))), 200
+
+# Upload routes
+@api_bp.route('/uploads', methods=['POST'])
+@jwt_required()
+def upload_image():
+    """Store an image sent as the raw body or as the "file" field of a multipart form"""
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            return jsonify({"error": "Missing file field"}), 400
+        stream = upload.stream
+    else:
+        stream = request.stream
+    
+    image, created = image_store.save(stream)
+    
+    return jsonify({
+        "message": "Image uploaded successfully" if created else "Image already uploaded",
+        "url": f"{request.script_root}/api/uploads/{image.filename}",
+        "variants": [f"{request.script_root}/api/uploads/{name}" for name in image.variants],
+        "sha256": image.digest,
+        "size": image.size
+    }), 201 if created else 200
+
+@api_bp.route('/uploads/<path:filename>', methods=['GET'])
+def get_upload(filename):
+    """Serve a stored image or one of its WebP variants"""
+    path = image_store.resolve(filename)
+    if path is None:
+        # A variant still being generated: serve the original meanwhile
+        original = image_store.original_name(filename)
+        if original is None:
+            abort(404)
+        return redirect(f"{request.script_root}/api/uploads/{original}", 302)
+    
+    # Names are content hashes: a URL always serves the same bytes
+    response = send_file(path, max_age=current_app.config.get('UPLOAD_CACHE_MAX_AGE', 31536000))
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Search routes
+@api_bp.route('/search', methods=['GET'])
+@response_cache.cached('news', 'player', 'team')
+def search():
+    """Ranked full-text search over news, players and teams"""
+    query = request.args.get('q', '').strip()
+    search_type = request.args.get('type')
+    
+    if not query:
+        return jsonify({"error": "Missing search query"}), 400
+    if search_type is not None and search_type not in SEARCH_TYPES:
+        return jsonify({"error": f"Unknown search type: {search_type}"}), 400
+    
+    # One type: a page of hits with a cursor; no type: the first page of each
+    if search_type is not None:
+        return jsonify(search_page(search_type, query, request.args.get('cursor'))), 200
+    return jsonify({name: search_page(name, query) for name in SEARCH_TYPES}), 200
@@ -1,5 +1,10 @@
-from marshmallow import Schema, fields, validate, post_load
+from marshmallow import Schema as BaseSchema, fields, validate, post_load
 from .models import User, Player, Team, Match, StaffMember, News, Partner
+from .profiling import profiled_dump
+
+class Schema(BaseSchema):
+    """Base of the API schemas: their dumps are timed when request profiling is on"""
+    dump = profiled_dump(BaseSchema.dump)
 
 class UserSchema(Schema):
     """Schema for serializing and deserializing User objects"""
@@ -77,6 +82,24 @@ class MatchSchema(Schema):
     away_team = fields.Nested('TeamSchema', exclude=('players',), dump_only=True)
     player_stats = fields.List(fields.Nested(PlayerMatchStatsSchema), dump_only=True)
 
+class StandingSchema(Schema):
+    """Schema for serializing Standing rows (read-only, maintained from match results)"""
+    season = fields.Str(dump_only=True)
+    team_id = fields.Int(dump_only=True)
+    played = fields.Int(dump_only=True)
+    won = fields.Int(dump_only=True)
+    drawn = fields.Int(dump_only=True)
+    lost = fields.Int(dump_only=True)
+    goals_for = fields.Int(dump_only=True)
+    goals_against = fields.Int(dump_only=True)
+    goal_difference = fields.Function(lambda standing: standing.goals_for - standing.goals_against, dump_only=True)
+    points = fields.Int(dump_only=True)
+    form = fields.Str(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+    
+    # Nested relationships
+    team = fields.Nested('TeamSchema', only=('id', 'name', 'logo_url'), dump_only=True)
+
 class StaffMemberSchema(Schema):
     """Schema for serializing and deserializing StaffMember objects"""
     id = fields.Int(dump_only=True)
@@ -94,6 +117,9 @@ class NewsSchema(Schema):
     id = fields.Int(dump_only=True)
     title = fields.Str(required=True)
     content = fields.Str(required=True)
+    excerpt = fields.Str(dump_only=True)
+    word_count = fields.Int(dump_only=True)
+    reading_time = fields.Int(dump_only=True)
     image_url = fields.Str()
     published_date = fields.DateTime()
     category = fields.Str()
@@ -128,11 +154,18 @@ teams_schema = TeamSchema(many=True)
 match_schema = MatchSchema()
 matches_schema = MatchSchema(many=True)
 
+standings_schema = StandingSchema(many=True)
+
 staff_member_schema = StaffMemberSchema()
 staff_members_schema = StaffMemberSchema(many=True)
 
+# Match sheet rows posted to /matches/<id>/stats take match_id from the URL
+match_sheet_schema = PlayerMatchStatsSchema(many=True, partial=('match_id',))
+
 news_schema = NewsSchema()
 news_items_schema = NewsSchema(many=True)
+# GET /news: the full content is only served by GET /news/<id>
+news_summaries_schema = NewsSchema(many=True, exclude=('content',))
 
 partner_schema = PartnerSchema()
 partners_schema = PartnerSchema(many=True)
\ No newline at end of file
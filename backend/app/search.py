@@ -0,0 +1,286 @@
+import base64
+import binascii
+import html
+import json
+import re
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import column, event, func, literal_column, select, table, text
+
+from .models import db, News, Player, Team
+from .pagination import PaginationError, page_limit
+
+SEARCH_TYPES = ('news', 'players', 'teams')
+
+# Words of a query kept for matching; words of SEARCH_MIN_PREFIX characters or
+# more also match as a prefix ("champ" finds "championship"), shorter ones only
+# as whole words, since a one-letter prefix matches nearly every article
+SEARCH_MAX_TERMS = 8
+SEARCH_MIN_PREFIX = 3
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+# Highlights are HTML: the database marks matches with these private-use
+# characters, then the text is escaped and they become the tags above
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+# PostgreSQL: the weighted document the GIN index is built on; queries must
+# use the exact same expression for the planner to pick the index
+NEWS_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(news.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(news.content, '')), 'B')"
+)
+PLAYER_NAME = "(player.first_name || ' ' || player.last_name)"
+
+POSTGRESQL_INDEXES = ('ix_news_search', 'ix_player_name_trgm', 'ix_team_name_trgm')
+POSTGRESQL_DDL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    f'CREATE INDEX IF NOT EXISTS ix_news_search ON news USING gin (({NEWS_DOCUMENT}))',
+    f'CREATE INDEX IF NOT EXISTS ix_player_name_trgm ON player USING gin ({PLAYER_NAME} gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_team_name_trgm ON team USING gin (name gin_trgm_ops)',
+)
+
+# SQLite: external-content FTS5 tables kept in sync by triggers, with a prefix
+# index for the shortest prefix searched
+SQLITE_FTS_TABLES = {
+    'news_fts': ('news', ('title', 'content')),
+    'player_fts': ('player', ('first_name', 'last_name')),
+    'team_fts': ('team', ('name',)),
+}
+
+
+def _sqlite_ddl(fts_table, table, columns):
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete = f"INSERT INTO {fts_table}({fts_table}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    insert = f'INSERT INTO {fts_table}(rowid, {names}) VALUES (new.id, {new_values});'
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({names}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='{SEARCH_MIN_PREFIX}')",
+        f'CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN {delete} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END',
+    )
+
+
+def create_search_indexes(connection):
+    """Create the search indexes of the connection's dialect and (re)build them"""
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRESQL_DDL:
+            connection.execute(text(statement))
+    elif dialect == 'sqlite':
+        for fts_table, (content_table, columns) in SQLITE_FTS_TABLES.items():
+            for statement in _sqlite_ddl(fts_table, content_table, columns):
+                connection.execute(text(statement))
+            connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+
+
+def drop_search_indexes(connection):
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        for index in POSTGRESQL_INDEXES:
+            connection.execute(text(f'DROP INDEX IF EXISTS {index}'))
+    elif dialect == 'sqlite':
+        # The sync triggers live on the content tables and would outlive the FTS tables
+        for fts_table in SQLITE_FTS_TABLES:
+            for suffix in ('ai', 'ad', 'au'):
+                connection.execute(text(f'DROP TRIGGER IF EXISTS {fts_table}_{suffix}'))
+            connection.execute(text(f'DROP TABLE IF EXISTS {fts_table}'))
+
+
+def is_search_object(name):
+    """Whether a table or index name belongs to the search indexes (FTS5 shadow tables included)"""
+    return name in POSTGRESQL_INDEXES or any(name.startswith(fts_table) for fts_table in SQLITE_FTS_TABLES)
+
+
+# db.create_all() / db.drop_all() manage the search indexes too; migrations call
+# the same functions (0005)
+@event.listens_for(db.metadata, 'after_create')
+def _after_create(metadata, connection, **kwargs):
+    create_search_indexes(connection)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _before_drop(metadata, connection, **kwargs):
+    drop_search_indexes(connection)
+
+
+def search_terms(query):
+    """Words of a free-text query, without any search syntax"""
+    return re.findall(r'\w+', query or '')[:SEARCH_MAX_TERMS]
+
+
+def _is_prefix(term):
+    return len(term) >= SEARCH_MIN_PREFIX
+
+
+def _fts5_query(terms):
+    return ' '.join(f'"{term}"*' if _is_prefix(term) else f'"{term}"' for term in terms)
+
+
+def _tsquery(terms):
+    return ' & '.join(f'{term}:*' if _is_prefix(term) else term for term in terms)
+
+
+def _to_html(marked):
+    """HTML of a text whose matches are wrapped in MARK_START / MARK_END"""
+    if not marked:
+        return marked
+    return html.escape(marked).replace(MARK_START, HIGHLIGHT_START).replace(MARK_END, HIGHLIGHT_END)
+
+
+def _highlight(value, terms):
+    """HTML of ``value`` with the words starting with one of the terms marked"""
+    if not value:
+        return value
+    value = value.replace(MARK_START, '').replace(MARK_END, '')
+    words = '|'.join(re.escape(term) + (r'\w*' if _is_prefix(term) else r'\b') for term in terms)
+    pattern = re.compile(rf'\b(?:{words})', re.IGNORECASE)
+    return _to_html(pattern.sub(lambda match: f'{MARK_START}{match.group(0)}{MARK_END}', value))
+
+
+def encode_offset(offset):
+    return base64.urlsafe_b64encode(json.dumps([offset]).encode()).decode().rstrip('=')
+
+
+def decode_offset(cursor):
+    """Offset behind a search cursor
+
+    Hits are ordered by a relevance computed for every match anyway, so
+    search pages use an offset rather than a keyset position.
+    """
+    if not cursor:
+        return 0
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        offset = int(values[0])
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, IndexError, KeyError):
+        raise PaginationError('Invalid cursor')
+    if offset < 0:
+        raise PaginationError('Invalid cursor')
+    return offset
+
+
+def _news_hits(terms, limit, offset, dialect):
+    if dialect == 'postgresql':
+        statement = text(f"""
+            WITH hits AS (
+                SELECT news.id, ts_rank_cd({NEWS_DOCUMENT}, query) AS rank
+                FROM news, to_tsquery('simple', :tsquery) AS query
+                WHERE {NEWS_DOCUMENT} @@ query
+                ORDER BY rank DESC, news.id
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT news.id, news.title, news.category, news.image_url, news.published_date, hits.rank,
+                ts_headline('simple', news.title, to_tsquery('simple', :tsquery),
+                    'HighlightAll=true, ' || :selectors) AS title_highlight,
+                ts_headline('simple', news.content, to_tsquery('simple', :tsquery),
+                    'MaxFragments=1, MinWords=12, MaxWords=30, ' || :selectors) AS snippet
+            FROM hits JOIN news ON news.id = hits.id
+            ORDER BY hits.rank DESC, news.id
+        """)
+        parameters = {'tsquery': _tsquery(terms), 'selectors': f'StartSel={MARK_START}, StopSel={MARK_END}'}
+    else:
+        # bm25() is lower for better matches; title words weigh 10x body words.
+        # As on PostgreSQL, the page is ranked first so that snippets are only
+        # built for its rows, not for every match.
+        statement = text("""
+            WITH hits AS (
+                SELECT rowid AS id, -bm25(news_fts, 10.0, 1.0) AS rank
+                FROM news_fts
+                WHERE news_fts MATCH :match
+                ORDER BY rank DESC, rowid
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT news.id, news.title, news.category, news.image_url, news.published_date, hits.rank,
+                highlight(news_fts, 0, :mark_start, :mark_end) AS title_highlight,
+                snippet(news_fts, 1, :mark_start, :mark_end, '…', 24) AS snippet
+            FROM hits
+            JOIN news_fts ON news_fts.rowid = hits.id
+            JOIN news ON news.id = hits.id
+            WHERE news_fts MATCH :match
+            ORDER BY hits.rank DESC, news.id
+        """)
+        parameters = {'match': _fts5_query(terms), 'mark_start': MARK_START, 'mark_end': MARK_END}
+
+    statement = statement.columns(published_date=News.published_date.type)
+    hits = []
+    for row in db.session.execute(statement, dict(parameters, limit=limit, offset=offset)):
+        hit = dict(row._mapping, rank=round(row.rank, 6))
+        hit['published_date'] = hit['published_date'] and hit['published_date'].isoformat()
+        hit['title_highlight'] = _to_html(hit['title_highlight'])
+        hit['snippet'] = _to_html(hit['snippet'])
+        hits.append(hit)
+    return hits
+
+
+def _name_hits(model, columns, name, name_keys, fts_table, terms, limit, offset, dialect):
+    """Ranked name matches: trigram similarity on PostgreSQL, FTS5 prefixes on SQLite"""
+    if dialect == 'postgresql':
+        query_text = ' '.join(terms)
+        rank = func.similarity(name, query_text)
+        statement = (
+            select(*columns, rank.label('rank'))
+            .where(name.op('%')(query_text) | name.icontains(query_text, autoescape=True))
+            .order_by(rank.desc(), model.id)
+            .limit(limit)
+            .offset(offset)
+        )
+    else:
+        fts = table(fts_table, column('rowid'))
+        rank = literal_column(f'-bm25({fts_table})')
+        statement = (
+            select(*columns, rank.label('rank'))
+            .join(fts, fts.c.rowid == model.id)
+            .where(literal_column(fts_table).op('MATCH')(_fts5_query(terms)))
+            .order_by(literal_column(f'bm25({fts_table})'), model.id)
+            .limit(limit)
+            .offset(offset)
+        )
+
+    hits = []
+    for row in db.session.execute(statement):
+        hit = dict(row._mapping, rank=round(row.rank, 6))
+        hit['name_highlight'] = _highlight(' '.join(hit[key] or '' for key in name_keys), terms)
+        hits.append(hit)
+    return hits
+
+
+def search_page(search_type, query, cursor=None, limit=None):
+    """One page of ranked hits: {"items", "next_cursor", "limit"}"""
+    terms = search_terms(query)
+    limit = limit or page_limit()
+    offset = decode_offset(cursor)
+    if not terms:
+        return {'items': [], 'next_cursor': None, 'limit': limit}
+
+    dialect = db.session.get_bind().dialect.name
+    # Fetch one extra hit to know whether another page exists
+    if search_type == 'news':
+        hits = _news_hits(terms, limit + 1, offset, dialect)
+    elif search_type == 'players':
+        # Rendered as PLAYER_NAME, so that the trigram index applies
+        name = Player.first_name + literal_column("' '") + Player.last_name
+        columns = (Player.id, Player.first_name, Player.last_name, Player.position, Player.team_id, Player.photo_url)
+        hits = _name_hits(Player, columns, name, ('first_name', 'last_name'), 'player_fts',
+                          terms, limit + 1, offset, dialect)
+    else:
+        columns = (Team.id, Team.name, Team.logo_url)
+        hits = _name_hits(Team, columns, Team.name, ('name',), 'team_fts', terms, limit + 1, offset, dialect)
+
+    next_cursor = encode_offset(offset + limit) if len(hits) > limit else None
+    return {'items': hits[:limit], 'next_cursor': next_cursor, 'limit': limit}
+
+
+search_cli = AppGroup('search', help='Maintain the full-text search indexes.')
+
+
+@search_cli.command('rebuild')
+def rebuild_command():
+    """Create missing search indexes and rebuild them from the tables"""
+    with db.engine.begin() as connection:
+        create_search_indexes(connection)
+    click.echo('Search indexes rebuilt')
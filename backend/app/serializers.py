@@ -0,0 +1,214 @@
+from datetime import date, datetime
+from functools import lru_cache
+
+from flask.json.provider import DefaultJSONProvider
+from marshmallow import fields
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from sqlalchemy import inspect
+from sqlalchemy.orm import aliased
+
+from .profiling import profiled_dump
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson
+
+    Keys stay sorted like the default provider; dates and other types orjson
+    would format differently are passed through to the default() hook, so the
+    decoded output is the same as with the stdlib encoder.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.options = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumps(self, obj, **kwargs):
+        # response() always asks for compact separators (orjson's only output)
+        # or, in debug mode, an indent of 2; other arguments use the stdlib encoder
+        if kwargs.get('separators') == (',', ':'):
+            del kwargs['separators']
+        option = self.options
+        if kwargs.get('indent') == 2:
+            del kwargs['indent']
+            option |= orjson.OPT_INDENT_2
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+
+# Value type each supported field produces, checked in MRO order (Date before DateTime)
+FIELD_TYPES = (
+    (fields.Date, date),
+    (fields.DateTime, datetime),
+    (fields.Integer, int),
+    (fields.Float, float),
+    (fields.Boolean, bool),
+    (fields.String, str),
+)
+
+
+def _value_expression(field, column, value):
+    """Python expression serializing ``value`` the way ``field`` would, or None if unsupported"""
+    for field_class, produced in FIELD_TYPES:
+        if isinstance(field, field_class):
+            break
+    else:
+        return None
+
+    if isinstance(field, fields.DateTime):
+        if field.format not in (None, 'iso'):
+            return None
+        return f'(None if {value} is None else {value}.isoformat())'
+    if isinstance(field, fields.Number) and field.as_string:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    # The driver already returns the right type: no conversion needed
+    if python_type is produced:
+        return value
+    return f'(None if {value} is None else {produced.__name__}({value}))'
+
+
+def _has_dump_hooks(schema):
+    return schema._has_processors(PRE_DUMP) or schema._has_processors(POST_DUMP)
+
+
+class CompiledSerializer:
+    """Serializer generated from a Marshmallow schema for row tuples
+
+    Instead of dumping ORM instances field by field, the schema is compiled
+    once into a SELECT of exactly the columns it outputs (many-to-one nested
+    objects come from LEFT JOINs) and a generated function that builds each
+    dict straight from a result row. The output matches schema.dump().
+    """
+
+    def __init__(self, schema, model, columns, joins, display):
+        self.schema = schema
+        self.model = model
+        self.many = schema.many
+        self.columns = columns
+        self.joins = joins
+        self.source = f'def serialize(row):\n    return {display}\n'
+        namespace = {}
+        exec(compile(self.source, f'<serializer {type(schema).__name__}>', 'exec'), namespace)
+        self.serialize = namespace['serialize']
+
+    def project(self, query, *required):
+        """Turn an ORM query on the model into a query of row tuples for this serializer
+
+        ``required`` columns (pagination sort keys) are selected under their
+        own key even if the schema does not output them.
+        """
+        labels = [column.label(label) for label, column in self.columns]
+        selected = {label for label, _ in self.columns}
+        labels.extend(column.label(column.key) for column in required if column.key not in selected)
+        query = query.with_entities(*labels)
+        for target, relationship in self.joins:
+            query = query.outerjoin(target, relationship.of_type(target))
+        return query
+
+    @profiled_dump
+    def dump(self, rows, many=None):
+        many = self.many if many is None else many
+        if many:
+            serialize = self.serialize
+            return [serialize(row) for row in rows]
+        return self.serialize(rows)
+
+
+def _compile_fields(schema, model, columns, joins, target=None, prefix=''):
+    """Source of a dict display for ``schema`` reading from ``row``, or None if unsupported"""
+    mapper = inspect(model)
+    entity = target if target is not None else model
+    items = []
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        key = field.data_key or name
+
+        if attribute in mapper.column_attrs:
+            column = getattr(entity, attribute)
+            index = len(columns)
+            columns.append((f'{prefix}{attribute}', column))
+            expression = _value_expression(field, mapper.column_attrs[attribute].columns[0], f'row[{index}]')
+            if expression is None:
+                return None
+            items.append(f'{key!r}: {expression}')
+
+        elif attribute in mapper.relationships:
+            relationship = mapper.relationships[attribute]
+            if (target is not None or not isinstance(field, fields.Nested) or field.many
+                    or relationship.uselist):
+                # Only many-to-one objects nested one level deep are compiled
+                return None
+            nested = field.schema
+            if nested.many or _has_dump_hooks(nested):
+                return None
+            related = relationship.mapper.class_
+            alias = aliased(related)
+            joins.append((alias, getattr(model, attribute)))
+
+            # The related primary key tells a missing object from a row of NULLs
+            primary_key = inspect(related).primary_key[0]
+            pk_index = len(columns)
+            columns.append((f'{attribute}__pk', getattr(alias, primary_key.key)))
+            display = _compile_fields(nested, related, columns, joins, alias, f'{attribute}__')
+            if display is None:
+                return None
+            items.append(f'{key!r}: (None if row[{pk_index}] is None else {display})')
+
+        else:
+            # Not loaded from the model: Marshmallow skips it unless it has a default
+            if field.dump_default is not fields.missing_:
+                if callable(field.dump_default):
+                    return None
+                items.append(f'{key!r}: {field.dump_default!r}')
+
+    return '{' + ', '.join(items) + '}'
+
+
+@lru_cache(maxsize=256)
+def compiled_serializer(schema, model):
+    """Compile ``schema`` (as dumped for ``model``) into a CompiledSerializer
+
+    Returns None when the schema uses something the compiler does not
+    reproduce exactly (one-to-many nesting, Function/Method fields, dump
+    hooks, custom formats); callers then fall back to schema.dump().
+    """
+    if _has_dump_hooks(schema):
+        return None
+    columns = []
+    joins = []
+    display = _compile_fields(schema, model, columns, joins)
+    if display is None:
+        return None
+
+    return CompiledSerializer(schema, model, columns, joins, display)
+
+
+def parity_errors(schema, model, query, limit=None):
+    """Differences between schema.dump() and the compiled serializer over ``query``
+
+    Returns a list of (index, marshmallow_item, compiled_item); empty when the
+    outputs match. Raises ValueError if the schema does not compile.
+    """
+    serializer = compiled_serializer(schema, model)
+    if serializer is None:
+        raise ValueError(f'{type(schema).__name__} cannot be compiled')
+    order = [getattr(model, column.key) for column in inspect(model).primary_key]
+
+    expected = schema.dump(query.order_by(*order).limit(limit).all(), many=True)
+    actual = serializer.dump(serializer.project(query).order_by(*order).limit(limit).all(), many=True)
+
+    errors = [(index, left, right) for index, (left, right) in enumerate(zip(expected, actual)) if left != right]
+    if len(expected) != len(actual):
+        errors.append((min(len(expected), len(actual)), len(expected), len(actual)))
+    return errors
@@ -0,0 +1,196 @@
+from collections import namedtuple
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import or_, select
+
+from .models import db, Match, Standing
+
+# Only league matches count towards the table
+STANDINGS_MATCH_TYPES = ('championship',)
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+FORM_LENGTH = 5
+
+COUNTERS = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'points')
+
+# The parts of a match that feed the table
+MatchResult = namedtuple('MatchResult', ['season', 'date', 'home_team_id', 'away_team_id', 'home_score', 'away_score'])
+
+
+def match_result(match):
+    """Snapshot a match's contribution to the table, or None if it does not count"""
+    if (match is None or match.status != 'played' or match.season is None
+            or match.match_type not in STANDINGS_MATCH_TYPES
+            or match.home_score is None or match.away_score is None):
+        return None
+    return MatchResult(match.season, match.date, match.home_team_id, match.away_team_id,
+                       match.home_score, match.away_score)
+
+
+def _outcomes(result):
+    """(team_id, scored, conceded) for both sides of a result"""
+    return (
+        (result.home_team_id, result.home_score, result.away_score),
+        (result.away_team_id, result.away_score, result.home_score)
+    )
+
+
+def _deltas(scored, conceded):
+    if scored > conceded:
+        won, drawn, lost, points = 1, 0, 0, POINTS_FOR_WIN
+    elif scored == conceded:
+        won, drawn, lost, points = 0, 1, 0, POINTS_FOR_DRAW
+    else:
+        won, drawn, lost, points = 0, 0, 1, 0
+    return dict(played=1, won=won, drawn=drawn, lost=lost,
+                goals_for=scored, goals_against=conceded, points=points)
+
+
+def _letter(scored, conceded):
+    return 'W' if scored > conceded else 'D' if scored == conceded else 'L'
+
+
+def _standing(season, team_id):
+    """Locked standing row for a team, created empty on first use"""
+    standing = Standing.query.filter_by(season=season, team_id=team_id).with_for_update().first()
+    if standing is None:
+        standing = Standing(season=season, team_id=team_id, form='', **{name: 0 for name in COUNTERS})
+        db.session.add(standing)
+    return standing
+
+
+def _apply(result, sign):
+    for team_id, scored, conceded in _outcomes(result):
+        standing = _standing(result.season, team_id)
+        for name, delta in _deltas(scored, conceded).items():
+            setattr(standing, name, getattr(standing, name) + sign * delta)
+
+
+def _recent_form(season, team_id):
+    """Last FORM_LENGTH results of a team, newest first, from one bounded query"""
+    statement = (
+        select(Match.home_team_id, Match.home_score, Match.away_score)
+        .where(Match.season == season)
+        .where(or_(Match.home_team_id == team_id, Match.away_team_id == team_id))
+        .where(Match.status == 'played')
+        .where(Match.match_type.in_(STANDINGS_MATCH_TYPES))
+        .where(Match.home_score.isnot(None), Match.away_score.isnot(None))
+        .order_by(Match.date.desc(), Match.id.desc())
+        .limit(FORM_LENGTH)
+    )
+    letters = []
+    for home_team_id, home_score, away_score in db.session.execute(statement):
+        if home_team_id == team_id:
+            letters.append(_letter(home_score, away_score))
+        else:
+            letters.append(_letter(away_score, home_score))
+    return ''.join(letters)
+
+
+def update_standings(old, new):
+    """Move the table from one match result to another
+
+    ``old`` and ``new`` are match_result() snapshots taken before and after a
+    write (None when the match did not / no longer counts). Counters are
+    adjusted by the difference; only the form of the teams involved is
+    re-read. Call before committing the match change.
+    """
+    if old == new:
+        return
+    if old is not None:
+        _apply(old, -1)
+    if new is not None:
+        _apply(new, 1)
+
+    affected = set()
+    for result in (old, new):
+        if result is not None:
+            affected.update((result.season, team_id) for team_id, _, _ in _outcomes(result))
+    for season, team_id in affected:
+        _standing(season, team_id).form = _recent_form(season, team_id)
+
+
+def compute_standings(season=None):
+    """Recompute the table from scratch: {(season, team_id): {counters..., form}}"""
+    statement = (
+        select(Match.season, Match.date, Match.home_team_id, Match.away_team_id,
+               Match.home_score, Match.away_score)
+        .where(Match.status == 'played')
+        .where(Match.season.isnot(None))
+        .where(Match.match_type.in_(STANDINGS_MATCH_TYPES))
+        .where(Match.home_score.isnot(None), Match.away_score.isnot(None))
+        # Newest first, so form letters are appended in display order
+        .order_by(Match.date.desc(), Match.id.desc())
+    )
+    if season:
+        statement = statement.where(Match.season == season)
+
+    table = {}
+    for row in db.session.execute(statement):
+        result = MatchResult(*row)
+        for team_id, scored, conceded in _outcomes(result):
+            entry = table.setdefault((result.season, team_id), dict({name: 0 for name in COUNTERS}, form=''))
+            for name, delta in _deltas(scored, conceded).items():
+                entry[name] += delta
+            if len(entry['form']) < FORM_LENGTH:
+                entry['form'] += _letter(scored, conceded)
+    return table
+
+
+def rebuild_standings(season=None):
+    """Replace the stored table (one season or all) with a full recompute"""
+    query = Standing.query
+    if season:
+        query = query.filter_by(season=season)
+    query.delete(synchronize_session=False)
+
+    table = compute_standings(season)
+    db.session.add_all(
+        Standing(season=key[0], team_id=key[1], **values) for key, values in table.items()
+    )
+    db.session.commit()
+    return len(table)
+
+
+def check_standings(season=None):
+    """Differences between the stored table and a full recompute"""
+    expected = compute_standings(season)
+    query = Standing.query
+    if season:
+        query = query.filter_by(season=season)
+
+    differences = []
+    empty = dict({name: 0 for name in COUNTERS}, form='')
+    for standing in query:
+        key = (standing.season, standing.team_id)
+        stored = {name: getattr(standing, name) for name in (*COUNTERS, 'form')}
+        wanted = expected.pop(key, empty)
+        if stored != wanted:
+            differences.append((key, stored, wanted))
+    for key, wanted in expected.items():
+        differences.append((key, None, wanted))
+    return differences
+
+
+standings_cli = AppGroup('standings', help='Maintain the materialized league standings.')
+
+
+@standings_cli.command('rebuild')
+@click.option('--season', default=None, help='Only rebuild this season (e.g. 2023-2024).')
+def rebuild_command(season):
+    """Recompute the standings table from played matches"""
+    count = rebuild_standings(season)
+    click.echo(f'{count} standings rows rebuilt')
+
+
+@standings_cli.command('check')
+@click.option('--season', default=None, help='Only check this season.')
+def check_command(season):
+    """Compare stored standings with a full recompute"""
+    differences = check_standings(season)
+    for (row_season, team_id), stored, wanted in differences:
+        click.echo(f'{row_season} team {team_id}: stored={stored} expected={wanted}')
+    if differences:
+        raise SystemExit(1)
+    click.echo('Standings are consistent')
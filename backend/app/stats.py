@@ -0,0 +1,143 @@
+from sqlalchemy import delete, func, insert, select, or_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import db, player_match, Player, Match
+
+# Columns of player_match that are summed into totals
+STAT_FIELDS = ('goals', 'assists', 'yellow_cards', 'red_cards', 'minutes_played')
+
+# Stats a leaderboard can be ranked on
+LEADERBOARD_STATS = ('goals', 'assists', 'yellow_cards', 'red_cards', 'minutes_played')
+LEADERBOARD_MAX_LIMIT = 100
+
+
+def _totals():
+    """Summed player_match columns, labelled with their stat name"""
+    return [func.coalesce(func.sum(player_match.c[name]), 0).label(name) for name in STAT_FIELDS]
+
+
+def _per_90(totals):
+    """Goal and assist rates per 90 minutes played"""
+    minutes = totals['minutes_played']
+    return {
+        'goals_per_90': round(totals['goals'] * 90 / minutes, 2) if minutes else None,
+        'assists_per_90': round(totals['assists'] * 90 / minutes, 2) if minutes else None
+    }
+
+
+def player_season_totals(player_id, season=None):
+    """Season-by-season totals of one player, from one GROUP BY query"""
+    statement = (
+        select(Match.season, func.count().label('appearances'), *_totals())
+        .select_from(player_match)
+        .join(Match, Match.id == player_match.c.match_id)
+        .where(player_match.c.player_id == player_id)
+        .group_by(Match.season)
+        .order_by(Match.season)
+    )
+    if season:
+        statement = statement.where(Match.season == season)
+
+    results = []
+    for row in db.session.execute(statement):
+        totals = dict(row._mapping)
+        totals.update(_per_90(totals))
+        results.append(totals)
+    return results
+
+
+def team_season_totals(team_id, season=None):
+    """Season-by-season totals of a team's players in the team's own matches"""
+    statement = (
+        select(
+            Match.season,
+            func.count(func.distinct(Match.id)).label('matches'),
+            func.count(func.distinct(player_match.c.player_id)).label('players_used'),
+            *_totals()
+        )
+        .select_from(player_match)
+        .join(Match, Match.id == player_match.c.match_id)
+        .join(Player, Player.id == player_match.c.player_id)
+        .where(Player.team_id == team_id)
+        .where(or_(Match.home_team_id == team_id, Match.away_team_id == team_id))
+        .group_by(Match.season)
+        .order_by(Match.season)
+    )
+    if season:
+        statement = statement.where(Match.season == season)
+
+    return [dict(row._mapping) for row in db.session.execute(statement)]
+
+
+def leaderboard(stat, season=None, limit=10):
+    """Top ``limit`` players by a summed stat, ranked by the database
+
+    The ORDER BY ... LIMIT runs in SQL, so only ``limit`` rows ever leave
+    the database however many seasons of stats are stored.
+    """
+    total = func.sum(player_match.c[stat]).label('total')
+    minutes = func.coalesce(func.sum(player_match.c.minutes_played), 0).label('minutes_played')
+    statement = (
+        select(
+            Player.id.label('player_id'),
+            Player.first_name,
+            Player.last_name,
+            Player.team_id,
+            func.count().label('appearances'),
+            total,
+            minutes
+        )
+        .select_from(player_match)
+        .join(Player, Player.id == player_match.c.player_id)
+        .group_by(Player.id, Player.first_name, Player.last_name, Player.team_id)
+        .having(func.sum(player_match.c[stat]) > 0)
+        # Ties go to the player who needed fewer minutes
+        .order_by(total.desc(), minutes, Player.id)
+        .limit(min(limit, LEADERBOARD_MAX_LIMIT))
+    )
+    if season:
+        statement = statement.join(Match, Match.id == player_match.c.match_id).where(Match.season == season)
+
+    return [dict(row._mapping, rank=rank) for rank, row in enumerate(db.session.execute(statement), 1)]
+
+
+def match_player_stats(match_id):
+    """player_match rows of one match, shaped like PlayerMatchStatsSchema"""
+    statement = (
+        select(player_match)
+        .where(player_match.c.match_id == match_id)
+        .order_by(player_match.c.player_id)
+    )
+    return [dict(row._mapping) for row in db.session.execute(statement)]
+
+
+def upsert_match_stats(match_id, rows):
+    """Write a match sheet with one multi-row INSERT ... ON CONFLICT DO UPDATE
+
+    ``rows`` are loaded PlayerMatchStatsSchema dicts for ``match_id``; stats
+    left out of a row are written as 0. The caller commits.
+    """
+    values = [
+        dict({name: row.get(name) or 0 for name in STAT_FIELDS}, player_id=row['player_id'], match_id=match_id)
+        for row in rows
+    ]
+    if not values:
+        return
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        statement = dialect_insert(player_match).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[player_match.c.player_id, player_match.c.match_id],
+            set_={name: statement.excluded[name] for name in STAT_FIELDS}
+        )
+        db.session.execute(statement)
+    else:
+        # Portable fallback: replace the submitted players' rows
+        db.session.execute(
+            delete(player_match)
+            .where(player_match.c.match_id == match_id)
+            .where(player_match.c.player_id.in_([value['player_id'] for value in values]))
+        )
+        db.session.execute(insert(player_match).values(values))
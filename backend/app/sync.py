@@ -0,0 +1,158 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event, insert, or_, select
+from sqlalchemy.orm import Session
+
+from .models import db, Player, Team, Match, StaffMember, News, Partner, User, Tombstone
+from .pagination import PaginationError, page_limit
+from .loading import PLAYER_RELATIONS, MATCH_RELATIONS, NEWS_RELATIONS, loading_plan
+from .schemas import (
+    players_schema, matches_schema, staff_members_schema, news_items_schema, partners_schema, TeamSchema
+)
+from .serializers import compiled_serializer
+
+# ``parents`` are (foreign key, model) pairs of the rows nested in each item:
+# a change to one of them makes the items embedding it changed too
+SyncResource = namedtuple('SyncResource', ['model', 'schema', 'relations', 'parents'])
+
+SYNC_RESOURCES = {
+    'players': SyncResource(Player, players_schema, PLAYER_RELATIONS, ((Player.team_id, Team),)),
+    # Rosters are synced through 'players', not nested in each team
+    'teams': SyncResource(Team, TeamSchema(many=True, exclude=('players',)), {}, ()),
+    'matches': SyncResource(Match, matches_schema, MATCH_RELATIONS,
+                            ((Match.home_team_id, Team), (Match.away_team_id, Team))),
+    'staff': SyncResource(StaffMember, staff_members_schema, {}, ()),
+    'news': SyncResource(News, news_items_schema, NEWS_RELATIONS, ((News.author_id, User),)),
+    'partners': SyncResource(Partner, partners_schema, {}, ()),
+}
+
+# Tables whose deletes leave a tombstone
+TRACKED_TABLES = {resource.model.__tablename__ for resource in SYNC_RESOURCES.values()}
+
+
+def _record_tombstones(session, flush_context):
+    """Write a tombstone for every synced row deleted by this flush, in the same transaction"""
+    rows = [
+        {'table_name': instance.__tablename__, 'row_id': instance.id, 'deleted_at': datetime.utcnow()}
+        for instance in session.deleted
+        if getattr(instance, '__tablename__', None) in TRACKED_TABLES
+    ]
+    if rows:
+        session.connection().execute(insert(Tombstone), rows)
+
+
+event.listen(Session, 'after_flush', _record_tombstones)
+
+
+def parse_watermark(value):
+    """Naive UTC datetime of a ``since`` value, as updated_at columns are stored"""
+    try:
+        since = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise PaginationError('since must be a watermark returned by a previous sync')
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def encode_cursor(since, watermark, last_id):
+    values = [since and since.isoformat(), watermark.isoformat(), last_id]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(since, watermark, last_id) carried from the first page of a sync"""
+    try:
+        since, watermark, last_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return since and datetime.fromisoformat(since), datetime.fromisoformat(watermark), int(last_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise PaginationError('Invalid cursor')
+
+
+def changed_since(resource, since):
+    """Filter for the rows of ``resource`` changed after ``since``, nested rows included"""
+    model = resource.model
+    clauses = [model.updated_at > since]
+    for foreign_key, parent in resource.parents:
+        clauses.append(foreign_key.in_(select(parent.id).where(parent.updated_at > since)))
+    return or_(*clauses)
+
+
+def sync_page(name, since=None, cursor=None):
+    """One page of the rows of a resource created or changed since a watermark
+
+    Without ``since`` (or with one older than the tombstones kept) the whole
+    collection is sent with ``reset``: the client replaces what it has.
+    Pages are keyed on id; ``watermark`` is fixed by the first page and is
+    what the client sends as ``since`` once it has read the last one. It
+    lags SYNC_WATERMARK_LAG_SECONDS behind the clock, so a row committed
+    late by a slow transaction is sent again rather than missed.
+    """
+    resource = SYNC_RESOURCES[name]
+    model = resource.model
+    limit = page_limit()
+
+    if cursor:
+        since, watermark, last_id = decode_cursor(cursor)
+    else:
+        lag = current_app.config.get('SYNC_WATERMARK_LAG_SECONDS', 5)
+        watermark = datetime.utcnow() - timedelta(seconds=lag)
+        last_id = None
+
+    retention = timedelta(days=current_app.config.get('SYNC_TOMBSTONE_DAYS', 30))
+    reset = since is None or since < datetime.utcnow() - retention
+
+    # Base query
+    query = model.query
+    if not reset:
+        query = query.filter(changed_since(resource, since))
+    if last_id is not None:
+        query = query.filter(model.id > last_id)
+
+    # Execute query, one extra row to know whether another page follows
+    serializer = current_app.config.get('FAST_SERIALIZATION', True) and compiled_serializer(resource.schema, model)
+    if serializer:
+        rows = serializer.project(query).order_by(model.id).limit(limit + 1).all()
+    else:
+        rows = query.options(*loading_plan(model, resource.relations)).order_by(model.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = serializer.dump(rows) if serializer else resource.schema.dump(rows)
+
+    # Deletes are listed once, on the first page
+    deleted = []
+    if not reset and cursor is None:
+        deleted = list(db.session.scalars(
+            select(Tombstone.row_id)
+            .where(Tombstone.table_name == model.__tablename__, Tombstone.deleted_at > since)
+            .distinct()
+            .order_by(Tombstone.row_id)
+        ))
+
+    return {
+        'items': items,
+        'deleted': deleted,
+        'reset': reset,
+        'watermark': watermark.isoformat(),
+        'next_cursor': encode_cursor(since, watermark, items[-1]['id']) if has_more else None,
+        'limit': limit
+    }
+
+
+sync_cli = AppGroup('sync', help='Maintain the delta sync tombstones.')
+
+
+@sync_cli.command('purge')
+def purge_command():
+    """Delete tombstones older than SYNC_TOMBSTONE_DAYS"""
+    retention = timedelta(days=current_app.config.get('SYNC_TOMBSTONE_DAYS', 30))
+    deleted = Tombstone.query.filter(Tombstone.deleted_at < datetime.utcnow() - retention).delete()
+    db.session.commit()
+    click.echo(f'{deleted} tombstones purged')
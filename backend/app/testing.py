@@ -0,0 +1,50 @@
+import os
+from contextlib import contextmanager
+from sqlalchemy import event, inspect
+from .models import db
+
+@contextmanager
+def count_queries(app):
+    """Collect every SQL statement executed on the app's engine"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def assert_query_count(client, url, expected, **kwargs):
+    """GET ``url`` with a test client and assert it ran exactly ``expected`` queries
+
+    Run it against datasets of different sizes: with the loading plans in
+    app.loading the count must not grow with the number of rows returned.
+    """
+    with count_queries(client.application) as statements:
+        response = client.get(url, **kwargs)
+    
+    assert len(statements) == expected, (
+        f'{url} ran {len(statements)} queries, expected {expected}:\n' + '\n'.join(statements)
+    )
+    return response
+
+def bench_database_url(filename):
+    """Database of a benchmark script: BENCH_DATABASE_URL, else a SQLite file of its own
+
+    Never DATABASE_URL: that is the application's database, and benchmarks drop their tables.
+    """
+    return os.environ.get('BENCH_DATABASE_URL', 'sqlite:///' + os.path.abspath(filename))
+
+def recreate_tables(reset):
+    """Create the tables of an empty database; existing tables are only dropped when ``reset``"""
+    if inspect(db.engine).get_table_names() and not reset:
+        url = db.engine.url.render_as_string(hide_password=True)
+        raise SystemExit(f'{url} already has tables: pass --reset-database to drop them')
+    db.drop_all()
+    db.create_all()
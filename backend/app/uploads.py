@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import namedtuple
+
+from .executors import thread_pool
+
+try:
+    from PIL import Image
+except ImportError:  # optional: uploads are stored without resized variants
+    Image = None
+
+# Magic numbers of the accepted image formats, with the extension they are stored under
+SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+SIGNATURE_LENGTH = max(len(signature) for signature, _ in SIGNATURES)
+
+# Stored names: <2 hex>/<sha256>.<ext> for originals, <2 hex>/<sha256>_<width>.webp for variants
+STORED_NAME = re.compile(r'^(?P<prefix>[0-9a-f]{2})/(?P<digest>[0-9a-f]{64})(?:_(?P<width>\d+)\.webp|\.(?P<ext>png|jpg|gif))$')
+
+StoredImage = namedtuple('StoredImage', ['digest', 'filename', 'size', 'variants'])
+
+
+class UploadError(ValueError):
+    """Raised for uploads that are not an accepted image"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _sniff(head, allowed_extensions):
+    for signature, extension in SIGNATURES:
+        if head.startswith(signature):
+            # 'jpeg' in ALLOWED_EXTENSIONS also allows JPEG files, stored as .jpg
+            if extension in allowed_extensions or (extension == 'jpg' and 'jpeg' in allowed_extensions):
+                return extension
+    raise UploadError('Unsupported image type', status=415)
+
+
+def _verify(path):
+    """Reject files that only start like an image (truncated or corrupt data)"""
+    if Image is None:
+        return
+    try:
+        with Image.open(path) as image:
+            image.verify()
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        raise UploadError('Invalid or corrupt image')
+
+
+class ImageStore:
+    """Content-addressed image storage under UPLOAD_FOLDER
+
+    Uploads are copied to a temporary file UPLOAD_CHUNK_SIZE bytes at a time
+    while their SHA-256 is computed, then renamed to a path derived from the
+    hash: the same image uploaded twice is stored once, and a stored file
+    never changes, so it can be served with an immutable Cache-Control.
+    When Pillow is installed, uploads are verified to be well-formed images
+    and WebP variants (UPLOAD_VARIANT_WIDTHS) are generated on a background
+    thread pool; requests never encode images themselves.
+    """
+
+    def __init__(self, app=None):
+        self.folder = None
+        self.chunk_size = 64 * 1024
+        self.variant_widths = (160, 640)
+        self.allowed_extensions = {'png', 'jpg', 'jpeg', 'gif'}
+        self._executor = None
+        self._lock = threading.Lock()
+        self.logger = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.folder = app.config.get('UPLOAD_FOLDER') or os.path.join(app.instance_path, 'uploads')
+        self.chunk_size = app.config.get('UPLOAD_CHUNK_SIZE', self.chunk_size)
+        self.variant_widths = tuple(app.config.get('UPLOAD_VARIANT_WIDTHS', self.variant_widths))
+        self.allowed_extensions = set(app.config.get('ALLOWED_EXTENSIONS', self.allowed_extensions))
+        # Variants are written outside of any app context
+        self.logger = app.logger
+        with self._lock:
+            if self._executor is None and Image is not None:
+                workers = app.config.get('UPLOAD_VARIANT_WORKERS', 1)
+                self._executor = thread_pool(workers, 'image-variants')
+
+    def _path(self, filename):
+        return os.path.join(self.folder, *filename.split('/'))
+
+    def variant_names(self, digest):
+        if Image is None:
+            return []
+        return [f'{digest[:2]}/{digest}_{width}.webp' for width in self.variant_widths]
+
+    def save(self, stream):
+        """Store an image read from ``stream``; returns (StoredImage, created)"""
+        temporary_folder = os.path.join(self.folder, 'tmp')
+        os.makedirs(temporary_folder, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+        extension = None
+        descriptor, temporary_path = tempfile.mkstemp(dir=temporary_folder)
+        try:
+            with os.fdopen(descriptor, 'wb') as output:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    # Check the magic number before writing more than its length
+                    if extension is None:
+                        head += chunk
+                        if len(head) >= SIGNATURE_LENGTH:
+                            extension = _sniff(head, self.allowed_extensions)
+                    digest.update(chunk)
+                    output.write(chunk)
+                    size += len(chunk)
+            if extension is None:
+                if not head:
+                    raise UploadError('Empty upload')
+                extension = _sniff(head, self.allowed_extensions)
+            _verify(temporary_path)
+
+            digest = digest.hexdigest()
+            filename = f'{digest[:2]}/{digest}.{extension}'
+            path = self._path(filename)
+            created = not os.path.exists(path)
+            if created:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temporary_path, path)
+                if self._executor is not None:
+                    future = self._executor.submit(self._generate_variants, digest, path)
+                    future.add_done_callback(lambda done: self._log_failure(done, digest))
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+        return StoredImage(digest, filename, size, self.variant_names(digest)), created
+
+    def _log_failure(self, future, digest):
+        # result() rather than exception(): gevent's futures raise from both
+        try:
+            future.result()
+        except Exception:
+            if self.logger is not None:
+                self.logger.exception('Image variants of %s failed', digest)
+
+    def _generate_variants(self, digest, path):
+        for width in self.variant_widths:
+            self._write_variant(digest, path, width)
+
+    def _write_variant(self, digest, path, width):
+        target = self._path(f'{digest[:2]}/{digest}_{width}.webp')
+        if os.path.exists(target):
+            return
+        with Image.open(path) as image:
+            image.thumbnail((width, width * 4))
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            # Write then rename, so a half-written variant is never served
+            temporary_path = f'{target}.{threading.get_ident()}.tmp'
+            try:
+                image.save(temporary_path, 'WEBP', quality=80)
+                os.replace(temporary_path, target)
+            finally:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+    def resolve(self, filename):
+        """Path of a stored file, or None if it is unknown or not generated yet"""
+        match = STORED_NAME.match(filename)
+        if match is None or match['prefix'] != match['digest'][:2]:
+            return None
+        path = self._path(filename)
+        return path if os.path.exists(path) else None
+
+    def original_name(self, filename):
+        """Stored name of the original of a variant, or None"""
+        match = STORED_NAME.match(filename)
+        if match is None or match['width'] is None or match['prefix'] != match['digest'][:2]:
+            return None
+        for _, extension in SIGNATURES:
+            original = f"{match['prefix']}/{match['digest']}.{extension}"
+            if os.path.exists(self._path(original)):
+                return original
+        return None
+
+
+image_store = ImageStore()
@@ -11,14 +11,123 @@ DB_HOST = os.environ.get('DB_HOST', 'localhost')
 DB_PORT = os.environ.get('DB_PORT', '5432')
 DB_NAME = os.environ.get('DB_NAME', 'esc_db')
 
-# SQLAlchemy configuration
-SQLALCHEMY_DATABASE_URI = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+# SQLAlchemy configuration (DATABASE_URL overrides, e.g. sqlite:////tmp/esc_bench.db for local load tests)
+SQLALCHEMY_DATABASE_URI = os.environ.get(
+    'DATABASE_URL',
+    f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+)
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# Connection pool configuration (per worker process: size the pool so that
+# workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below the server's max_connections)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '10'))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))  # seconds before a connection is replaced
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True') == 'True'
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', '5'))  # seconds
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '30000'))  # 0 disables it
+# Behind PgBouncer (transaction pooling) the bouncer owns the pool: open a
+# connection per checkout and send no startup options it would reject
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'False') == 'True'
+
+
+def engine_options(uri):
+    """SQLAlchemy create_engine() options for a database URI"""
+    if not uri.startswith('postgresql'):
+        # SQLite (local runs, benchmarks) keeps Flask-SQLAlchemy's defaults
+        return {}
+    connect_args = {'connect_timeout': DB_CONNECT_TIMEOUT}
+    if DB_PGBOUNCER:
+        from sqlalchemy.engine import make_url
+        from sqlalchemy.pool import NullPool
+        if make_url(uri).get_dialect().driver == 'psycopg':
+            # psycopg 3 prepares repeated statements server-side, which transaction pooling breaks
+            connect_args['prepare_threshold'] = None
+        # Set statement_timeout on the database role instead (ALTER ROLE ... SET statement_timeout)
+        return {'poolclass': NullPool, 'connect_args': connect_args}
+    if DB_STATEMENT_TIMEOUT_MS:
+        connect_args['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'connect_args': connect_args
+    }
+
+
+SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+# Read replicas (comma-separated URIs): GET requests read from a random replica, except for
+# READ_REPLICA_STICKY_SECONDS after the same client wrote, when they read from the primary
+# (writes return the window's end, signed with SECRET_KEY, in READ_REPLICA_HEADER; the client sends it back)
+DATABASE_REPLICA_URLS = [url for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url]
+SQLALCHEMY_BINDS = {
+    f'replica_{number}': dict(engine_options(url), url=url)
+    for number, url in enumerate(DATABASE_REPLICA_URLS, 1)
+}
+READ_REPLICA_STICKY_SECONDS = int(os.environ.get('READ_REPLICA_STICKY_SECONDS', '5'))
+READ_REPLICA_HEADER = os.environ.get('READ_REPLICA_HEADER', 'X-DB-Primary-Until')
+
+# Pagination configuration (list endpoints use keyset cursors)
+PAGINATION_DEFAULT_LIMIT = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', '50'))
+PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', '200'))
+
+# Response cache configuration (in-process cache of public GET responses)
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '60'))  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Response compression (gzip, and brotli when installed; negotiated on Accept-Encoding)
+COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True') == 'True'
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))  # bytes; smaller bodies are sent as is
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 4
+# Cached responses are compressed once per encoding and kept with the entry, so they afford higher levels
+COMPRESS_CACHED_GZIP_LEVEL = 9
+COMPRESS_CACHED_BROTLI_QUALITY = 9
+
+# Serialization (list routes dump row tuples through compiled serializers; orjson is used when installed)
+FAST_SERIALIZATION = os.environ.get('FAST_SERIALIZATION', 'True') == 'True'
+JSON_ORJSON = os.environ.get('JSON_ORJSON', 'True') == 'True'
+
+# Request profiling (opt-in: Server-Timing headers, slow request log, Prometheus metrics for admins)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SLOW_REQUEST_MS = int(os.environ.get('PROFILING_SLOW_REQUEST_MS', '500'))
+PROFILING_SLOW_STATEMENTS = int(os.environ.get('PROFILING_SLOW_STATEMENTS', '10'))
+PROFILING_METRICS_PATH = os.environ.get('PROFILING_METRICS_PATH', '/metrics')
+
 # JWT configuration
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'super-secret-key-change-in-production')
 JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
 
+# Identity cache (user id -> role for authenticated requests, per worker process)
+IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', '30'))  # seconds
+IDENTITY_CACHE_MAX_ENTRIES = int(os.environ.get('IDENTITY_CACHE_MAX_ENTRIES', '1024'))
+
+# Password hashing (Werkzeug method with its work factor; older hashes are upgraded at login)
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))  # concurrent hashes per process
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', '16'))  # waiting logins before 503
+
+# Live match streams (Server-Sent Events, per worker process)
+LIVE_MAX_SUBSCRIBERS = int(os.environ.get('LIVE_MAX_SUBSCRIBERS', '1000'))  # open streams before 503
+LIVE_HEARTBEAT_SECONDS = int(os.environ.get('LIVE_HEARTBEAT_SECONDS', '15'))
+LIVE_QUEUE_SIZE = 16  # frames buffered per client; slow clients lose the oldest
+
+# Homepage (GET /api/home, built in a fixed number of queries and cached as one response)
+HOME_NEWS_COUNT = 3
+HOME_RESULTS_COUNT = 3
+HOME_STANDINGS_COUNT = 5
+HOME_EXCERPT_LENGTH = 200  # characters of each news teaser, at most app.news.NEWS_EXCERPT_LENGTH
+
+# Delta sync (GET /api/sync/<resource>?since=)
+SYNC_TOMBSTONE_DAYS = int(os.environ.get('SYNC_TOMBSTONE_DAYS', '30'))  # older watermarks get a full resync
+SYNC_WATERMARK_LAG_SECONDS = 5  # margin for transactions committing after the watermark was taken
+
 # Application configuration
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 DEBUG = os.environ.get('DEBUG', 'True') == 'True'
@@ -26,4 +135,10 @@ DEBUG = os.environ.get('DEBUG', 'True') == 'True'
 # File upload configuration
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max upload size
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
\ No newline at end of file
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+UPLOAD_CHUNK_SIZE = 64 * 1024  # bytes written to disk per read
+UPLOAD_VARIANT_WIDTHS = (160, 640)  # WebP thumbnails generated in the background (needs Pillow)
+UPLOAD_VARIANT_WORKERS = int(os.environ.get('UPLOAD_VARIANT_WORKERS', '1'))
+UPLOAD_CACHE_MAX_AGE = 365 * 24 * 3600  # uploads are content-addressed, so cache them for a year
+# Let the front web server send files (X-Sendfile); otherwise the WSGI server's sendfile() is used
+USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'False') == 'True'
\ No newline at end of file
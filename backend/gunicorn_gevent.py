@@ -0,0 +1,20 @@
+"""gunicorn settings of ``make run-backend-async``: the API in one gevent worker
+
+One worker, so that every live match stream shares the process (and the
+LiveHub) that handles the writes. Everything it runs must yield to the event
+loop while it waits: psycopg2 does once psycogreen has installed its wait
+callback, and password hashes and image variants run on native threads
+(see app.executors).
+"""
+
+bind = '0.0.0.0:5000'
+worker_class = 'gevent'
+workers = 1
+worker_connections = 2000
+
+
+def post_fork(server, worker):
+    # psycopg2 is a C extension that gevent cannot monkey-patch: without this,
+    # every query blocks all the connections of the worker
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
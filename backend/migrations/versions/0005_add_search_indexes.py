@@ -0,0 +1,26 @@
+"""add search indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:02:41.512930
+
+"""
+from alembic import op
+
+from app.search import create_search_indexes, drop_search_indexes
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL: pg_trgm + GIN indexes; SQLite: FTS5 tables and their sync triggers
+    create_search_indexes(op.get_bind())
+
+
+def downgrade():
+    drop_search_indexes(op.get_bind())
@@ -1,6 +1,11 @@
+import argparse
+import csv
+import io
 import os
 import sys
 import random
+import time
+from collections import namedtuple
 from datetime import datetime, timedelta
 from faker import Faker
 from werkzeug.security import generate_password_hash
@@ -10,7 +15,10 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 # Import the app and models
 from app import create_app
-from app.models import db, User, Player, Team, Match, StaffMember, News, Partner
+from sqlalchemy import insert, text
+from app.models import db, player_match, User, Player, Team, Match, StaffMember, News, Partner
+from app.standings import rebuild_standings
+from app.news import summarize
 
 # Initialize Faker
 fake = Faker()
@@ -189,9 +197,11 @@ def create_news(count=15):
     admin = User.query.filter_by(username='admin').first()
     
     for i in range(count):
+        content = '\n\n'.join(fake.paragraphs(nb=5))
         news = News(
             title=fake.sentence(),
-            content='\n\n'.join(fake.paragraphs(nb=5)),
+            content=content,
+            **summarize(content),
             image_url=f'https://example.com/news_{i}.png',
             published_date=fake.date_time_between(start_date='-60d', end_date='now'),
             category=random.choice(categories),
@@ -235,6 +245,10 @@ def seed_data():
     # Create matches
     create_matches(20, teams)
     
+    # Build the standings table from the played matches
+    rebuild_standings()
+    print("Standings rebuilt")
+    
     # Create staff members
     create_staff_members(10)
     
@@ -246,7 +260,240 @@ def seed_data():
     
     print("Data seeding completed successfully!")
 
+# Bulk seeding for load and benchmark datasets
+#
+# Rows are generated from Faker pools built once, with explicit primary keys so
+# foreign keys never need a round-trip, and written with PostgreSQL COPY (or
+# batched executemany elsewhere). Dates are relative to a fixed reference so the
+# same seed always rebuilds the same database; created_at / updated_at are
+# written explicitly (their defaults are Python-side, which COPY bypasses).
+
+SCALES = {
+    'medium': dict(teams=100, players=20000, matches=5000, stats_per_match=22, news=5000, staff=200, partners=50),
+    'large': dict(teams=1000, players=500000, matches=91000, stats_per_match=22, news=100000, staff=2000, partners=200),
+}
+
+BULK_REFERENCE_DATE = datetime(2024, 6, 1)
+BULK_CHUNK_SIZE = 50000
+BULK_POOL_SIZE = 1000
+
+# Match rows are named: played ones are picked out to attach player stats to them
+MatchRow = namedtuple('MatchRow', ['id', 'date', 'home_team_id', 'away_team_id', 'home_score', 'away_score', 'venue',
+                                   'match_type', 'season', 'status', 'summary'])
+
+def build_pools(faker, size=BULK_POOL_SIZE):
+    """Pre-generate Faker values once; rows then pick from them"""
+    return {
+        'first_names': [faker.first_name_male() for _ in range(size)],
+        'last_names': [faker.last_name() for _ in range(size)],
+        'countries': [faker.country() for _ in range(200)],
+        'companies': [faker.company() for _ in range(size)],
+        'cities': [faker.city() for _ in range(size)],
+        'sentences': [faker.sentence() for _ in range(size)],
+        'paragraphs': [faker.paragraph() for _ in range(size)],
+        'urls': [faker.url() for _ in range(200)],
+    }
+
+def copy_rows(table, columns, rows):
+    """Write an iterable of row tuples in chunks: COPY on PostgreSQL, executemany elsewhere"""
+    connection = db.session.connection()
+    postgres = connection.dialect.name == 'postgresql'
+    count = 0
+    chunk = []
+    
+    def flush(chunk):
+        if postgres:
+            preparer = connection.dialect.identifier_preparer
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(chunk)
+            buffer.seek(0)
+            column_list = ', '.join(preparer.quote(name) for name in columns)
+            cursor = connection.connection.dbapi_connection.cursor()
+            cursor.copy_expert(
+                f'COPY {preparer.format_table(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer
+            )
+        else:
+            connection.execute(insert(table), [dict(zip(columns, row)) for row in chunk])
+    
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            flush(chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+        count += len(chunk)
+    return count
+
+def reset_sequences(*tables):
+    """Move PostgreSQL id sequences past the explicit ids written by COPY"""
+    connection = db.session.connection()
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM \"{table.name}\"), 1))"
+        ))
+
+def team_of_player(player_id, players, teams):
+    """Players are assigned to teams in contiguous id blocks"""
+    return (player_id - 1) * teams // players + 1
+
+def bulk_teams(rng, pools, count):
+    yield (1, 'Espoir Sportif de Chorbane', 'https://example.com/esc_logo.png', 1980,
+           'Stade Municipal de Chorbane', 'Espoir Sportif de Chorbane est un club de football tunisien fondé en 1980.')
+    for team_id in range(2, count + 1):
+        yield (team_id, f"{rng.choice(pools['companies'])} FC {team_id}", f'https://example.com/logo_{team_id}.png',
+               rng.randint(1900, 2015), rng.choice(pools['cities']) + ' Stadium', rng.choice(pools['paragraphs']))
+
+def bulk_players(rng, pools, count, teams):
+    positions = ['goalkeeper', 'defender', 'midfielder', 'forward']
+    categories = ['Seniors', 'U19', 'U17', 'U15']
+    for player_id in range(1, count + 1):
+        yield (player_id, rng.choice(pools['first_names']), rng.choice(pools['last_names']), rng.randint(1, 99),
+               rng.choice(positions), (BULK_REFERENCE_DATE - timedelta(days=rng.randint(16 * 365, 40 * 365))).date(),
+               rng.choice(pools['countries']), f'https://example.com/player_{player_id}.png',
+               rng.choice(pools['paragraphs']), round(rng.uniform(165, 195), 1), round(rng.uniform(60, 90), 1),
+               team_of_player(player_id, count, teams), rng.choice(categories))
+
+def bulk_matches(rng, pools, count, teams):
+    """Matches spread over ten seasons; those before the reference date are played"""
+    match_types = ['championship', 'championship', 'cup', 'friendly']
+    span = 10 * 365 * 24
+    for match_id in range(1, count + 1):
+        home_team_id = rng.randint(1, teams)
+        away_team_id = rng.randint(1, teams - 1)
+        if away_team_id >= home_team_id:
+            away_team_id += 1
+        date = BULK_REFERENCE_DATE - timedelta(hours=span * 9 // 10) + timedelta(hours=rng.randint(0, span))
+        season_start = date.year if date.month >= 8 else date.year - 1
+        played = date < BULK_REFERENCE_DATE
+        yield MatchRow(match_id, date, home_team_id, away_team_id,
+                       rng.randint(0, 5) if played else None, rng.randint(0, 5) if played else None,
+                       f'Stadium {home_team_id}', rng.choice(match_types), f'{season_start}-{season_start + 1}',
+                       'played' if played else 'upcoming', rng.choice(pools['paragraphs']) if played else None)
+
+def bulk_player_stats(rng, match_rows, players, teams, per_match):
+    """Up to per_match players from the two rosters of each played match"""
+    block = max(players // teams, 1)
+    for match_id, home_team_id, away_team_id in match_rows:
+        for team_id in (home_team_id, away_team_id):
+            first = (team_id - 1) * players // teams + 1
+            roster = range(first, min(first + block, players + 1))
+            for player_id in rng.sample(roster, min(per_match // 2, len(roster))):
+                yield (player_id, match_id, rng.choice([0, 0, 0, 0, 1, 1, 2]), rng.choice([0, 0, 0, 1]),
+                       rng.choice([0, 0, 0, 0, 1]), rng.choice([0] * 30 + [1]), rng.choice([90, 90, 90, 75, 60, 45, 20]))
+
+def bulk_news(rng, pools, count, author_id):
+    categories = ['match report', 'club news', 'announcement', 'interview', 'press release']
+    for news_id in range(1, count + 1):
+        content = '\n\n'.join(rng.choice(pools['paragraphs']) for _ in range(5))
+        summary = summarize(content)
+        yield (news_id, rng.choice(pools['sentences']), content, summary['excerpt'], summary['word_count'],
+               summary['reading_time'], f'https://example.com/news_{news_id}.png',
+               BULK_REFERENCE_DATE - timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60)), rng.choice(categories), author_id)
+
+def bulk_staff(rng, pools, count):
+    roles = ['Head Coach', 'Assistant Coach', 'Goalkeeper Coach', 'Fitness Coach', 'Physiotherapist',
+             'Team Doctor', 'Technical Director', 'Scout', 'Analyst', 'Team Manager']
+    for staff_id in range(1, count + 1):
+        yield (staff_id, rng.choice(pools['first_names']), rng.choice(pools['last_names']), rng.choice(roles),
+               f'https://example.com/staff_{staff_id}.png', rng.choice(pools['paragraphs']),
+               (BULK_REFERENCE_DATE - timedelta(days=rng.randint(0, 5 * 365))).date())
+
+def bulk_partners(rng, pools, count):
+    levels = ['platinum', 'gold', 'silver', 'bronze']
+    for partner_id in range(1, count + 1):
+        yield (partner_id, rng.choice(pools['companies']), f'https://example.com/partner_{partner_id}.png',
+               rng.choice(pools['urls']), rng.choice(pools['paragraphs']), rng.choice(levels))
+
+def bulk_seed_data(teams, players, matches, stats_per_match, news, staff, partners, seed=42):
+    """Seed a production-sized dataset, deterministically for a given seed"""
+    if teams < 1 or (matches and teams < 2):
+        raise ValueError('Bulk seeding needs at least one team, and two to create matches')
+    rng = random.Random(seed)
+    faker = Faker()
+    faker.seed_instance(seed)
+    started = time.perf_counter()
+    print(f"Starting bulk seeding (seed={seed})...")
+    
+    # SQLite: trade durability for load speed, this database is disposable
+    if db.session.connection().dialect.name == 'sqlite':
+        db.session.execute(text('PRAGMA synchronous = OFF'))
+    
+    create_admin_user()
+    db.session.flush()
+    admin = User.query.filter_by(username='admin').first()
+    
+    pools = build_pools(faker)
+    print(f"Faker pools built in {time.perf_counter() - started:.1f}s")
+    
+    def load(label, table, columns, rows):
+        step = time.perf_counter()
+        timestamps = [name for name in ('created_at', 'updated_at') if name in table.c]
+        if timestamps:
+            stamp = (BULK_REFERENCE_DATE,) * len(timestamps)
+            columns = columns + timestamps
+            rows = (row + stamp for row in rows)
+        count = copy_rows(table, columns, rows)
+        print(f"{count} {label} created in {time.perf_counter() - step:.1f}s")
+    
+    load('teams', Team.__table__,
+         ['id', 'name', 'logo_url', 'founded_year', 'home_stadium', 'description'],
+         bulk_teams(rng, pools, teams))
+    load('players', Player.__table__,
+         ['id', 'first_name', 'last_name', 'jersey_number', 'position', 'birth_date', 'nationality',
+          'photo_url', 'bio', 'height', 'weight', 'team_id', 'category'],
+         bulk_players(rng, pools, players, teams))
+    
+    # Keep (id, home, away) of played matches to attach player stats to them
+    played = []
+    def remember_played(rows):
+        for row in rows:
+            if row.status == 'played':
+                played.append((row.id, row.home_team_id, row.away_team_id))
+            yield row
+    load('matches', Match.__table__, list(MatchRow._fields),
+         remember_played(bulk_matches(rng, pools, matches, teams)))
+    load('player_match rows', player_match,
+         ['player_id', 'match_id', 'goals', 'assists', 'yellow_cards', 'red_cards', 'minutes_played'],
+         bulk_player_stats(rng, played, players, teams, stats_per_match))
+    load('news items', News.__table__,
+         ['id', 'title', 'content', 'excerpt', 'word_count', 'reading_time', 'image_url', 'published_date', 'category',
+          'author_id'],
+         bulk_news(rng, pools, news, admin.id))
+    load('staff members', StaffMember.__table__,
+         ['id', 'first_name', 'last_name', 'role', 'photo_url', 'bio', 'start_date'],
+         bulk_staff(rng, pools, staff))
+    load('partners', Partner.__table__,
+         ['id', 'name', 'logo_url', 'website_url', 'description', 'partnership_level'],
+         bulk_partners(rng, pools, partners))
+    
+    reset_sequences(Team.__table__, Player.__table__, Match.__table__, News.__table__,
+                    StaffMember.__table__, Partner.__table__)
+    db.session.commit()
+    
+    rebuild_standings()
+    print("Standings rebuilt")
+    print(f"Bulk seeding completed in {time.perf_counter() - started:.1f}s")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Seed the database with sample data.')
+    parser.add_argument('--scale', choices=['small', *SCALES], default='small',
+                        help='small: the demo dataset; medium/large: bulk datasets for load tests')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed, for reproducible datasets')
+    for name in SCALES['large']:
+        parser.add_argument('--' + name.replace('_', '-'), type=int, default=None,
+                            help=f'Override the {name} count of the bulk scale')
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
+    args = parse_args()
+    random.seed(args.seed)
+    Faker.seed(args.seed)
+    
     # Create app context
     app = create_app()
     
@@ -256,4 +503,9 @@ if __name__ == '__main__':
         db.create_all()
         
         # Seed data
-        seed_data()
\ No newline at end of file
+        if args.scale == 'small':
+            seed_data()
+        else:
+            counts = dict(SCALES[args.scale])
+            counts.update({name: getattr(args, name) for name in counts if getattr(args, name) is not None})
+            bulk_seed_data(seed=args.seed, **counts)
\ No newline at end of file
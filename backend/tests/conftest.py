@@ -0,0 +1,43 @@
+import pytest
+
+import seed_data
+from app import create_app
+from app.models import db
+
+# Two bulk datasets: the larger one fills whole pages, so a query issued per
+# row would show up as a different count
+DATASETS = {
+    'small': dict(teams=3, players=12, matches=10, stats_per_match=4, news=6, staff=3, partners=2),
+    'large': dict(teams=10, players=200, matches=120, stats_per_match=10, news=80, staff=60, partners=60),
+}
+
+
+class TestConfig:
+    TESTING = True
+    SECRET_KEY = 'test'
+    JWT_SECRET_KEY = 'test-secret-key-of-at-least-32-bytes'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Every request must reach the database to be counted
+    RESPONSE_CACHE_ENABLED = False
+    # A cheap work factor: the admin user is hashed once per dataset
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture(scope='session', params=list(DATASETS))
+def app(request, tmp_path_factory):
+    """App over a bulk-seeded SQLite database, once per dataset size"""
+    path = tmp_path_factory.mktemp(request.param) / 'test.db'
+    config = type('Config', (TestConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'UPLOAD_FOLDER': str(path.parent / 'uploads')
+    })
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        seed_data.bulk_seed_data(**DATASETS[request.param])
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,31 @@
+import pytest
+from flask import Flask
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash
+
+from app.auth import PasswordHasher
+
+
+def test_register_ignores_requested_role(client):
+    response = client.post('/api/auth/register', json={
+        'username': 'intruder', 'email': 'intruder@example.com', 'password': 'secret123', 'role': 'admin'
+    })
+    assert response.status_code == 201
+    assert response.get_json()['user']['role'] == 'user'
+
+
+@pytest.mark.parametrize('method, stored', [
+    ('pbkdf2', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'),
+    ('pbkdf2:sha256', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'),
+    ('pbkdf2:sha512', f'pbkdf2:sha512:{DEFAULT_PBKDF2_ITERATIONS}'),
+    ('pbkdf2:sha256:1000', 'pbkdf2:sha256:1000'),
+    ('scrypt', 'scrypt:32768:8:1'),
+    ('scrypt:16384:8:1', 'scrypt:16384:8:1'),
+])
+def test_configured_method_matches_what_werkzeug_stores(method, stored):
+    app = Flask(__name__)
+    app.config['PASSWORD_HASH_METHOD'] = method
+    hasher = PasswordHasher(app)
+    password_hash = generate_password_hash('secret', method)
+    assert password_hash.startswith(stored + '$')
+    assert not hasher.needs_rehash(password_hash)
+    assert hasher.needs_rehash(generate_password_hash('secret', 'pbkdf2:sha256:1001'))
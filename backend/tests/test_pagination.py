@@ -0,0 +1,33 @@
+import pytest
+
+from app.models import db, News
+
+
+@pytest.fixture
+def undated_news(app):
+    """Two news items without a published_date, removed afterwards"""
+    with app.app_context():
+        author_id = News.query.first().author_id
+        items = [News(title=f'Undated {number}', content='Draft', author_id=author_id) for number in (1, 2)]
+        db.session.add_all(items)
+        db.session.flush()
+        ids = [item.id for item in items]
+        News.query.filter(News.id.in_(ids)).update({News.published_date: None})
+        db.session.commit()
+    yield ids
+    with app.app_context():
+        for item in News.query.filter(News.id.in_(ids)):
+            db.session.delete(item)
+        db.session.commit()
+
+
+def test_news_pages_reach_rows_without_a_published_date(app, client, undated_news):
+    seen = []
+    url = '/api/news?limit=3'
+    while url:
+        page = client.get(url).get_json()
+        seen.extend(item['id'] for item in page['items'])
+        url = page['next_cursor'] and f"/api/news?limit=3&cursor={page['next_cursor']}"
+    with app.app_context():
+        assert sorted(seen) == sorted(news_id for news_id, in db.session.query(News.id))
+    assert set(undated_news) <= set(seen)
@@ -0,0 +1,38 @@
+import pytest
+
+from app.testing import assert_query_count
+
+# Queries per GET, the same whatever the number of rows: the conditional-GET
+# state query, then the page or row itself (with its eager loads).
+# Team rosters add their selectinload; a match detail adds its player stats.
+QUERY_COUNTS = [
+    ('/api/players', 2),
+    ('/api/players?include=team', 2),
+    ('/api/players/1', 2),
+    ('/api/teams', 3),
+    ('/api/teams/1', 3),
+    ('/api/matches', 2),
+    ('/api/matches?fields=id,home_team.name', 2),
+    ('/api/matches/1', 3),
+    ('/api/standings', 2),
+    ('/api/staff', 2),
+    ('/api/staff/1', 2),
+    ('/api/news', 2),
+    ('/api/news/1', 2),
+    ('/api/partners', 2),
+    ('/api/partners/1', 2),
+]
+
+
+@pytest.fixture(params=[True, False], ids=['compiled', 'marshmallow'])
+def serialization(app, request):
+    """Run each check on both serialization paths (see app.serializers)"""
+    app.config['FAST_SERIALIZATION'] = request.param
+    yield request.param
+    app.config['FAST_SERIALIZATION'] = True
+
+
+@pytest.mark.parametrize('url, expected', QUERY_COUNTS)
+def test_query_count_does_not_grow_with_rows(client, serialization, url, expected):
+    response = assert_query_count(client, url, expected)
+    assert response.status_code == 200
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from app import create_app
+from app.models import db
+
+from .conftest import TestConfig
+
+
+@pytest.fixture
+def replica_client(app):
+    """Client of an app whose single replica is the primary database itself"""
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    config = type('Config', (TestConfig,), {
+        'SQLALCHEMY_DATABASE_URI': uri,
+        'SQLALCHEMY_BINDS': {'replica_1': uri},
+        'UPLOAD_FOLDER': app.config['UPLOAD_FOLDER']
+    })
+    yield create_app(config).test_client()
+    # Flask-SQLAlchemy keeps one metadata per bind key: drop the replica's so
+    # that apps created afterwards have no unknown bind to create tables on
+    db.metadatas.pop('replica_1', None)
+
+
+def test_a_write_pins_the_client_to_the_primary(replica_client):
+    login = replica_client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+    headers = {'Authorization': 'Bearer ' + login.get_json()['access_token']}
+    response = replica_client.put('/api/partners/1', json={'description': 'Pinned'}, headers=headers)
+    assert response.status_code == 200
+    until = response.headers['X-DB-Primary-Until']
+
+    assert replica_client.get('/api/partners').headers['X-DB-Route'] == 'replica_1'
+    pinned = replica_client.get('/api/partners', headers={'X-DB-Primary-Until': until})
+    assert pinned.headers['X-DB-Route'] == 'primary'
+
+
+@pytest.mark.parametrize('value', [
+    lambda: str(int((time.time() + 3) * 1000)),
+    lambda: str(time.time() + 3),
+    lambda: f'{int((time.time() + 3) * 1000)}.forged',
+])
+def test_an_unsigned_window_is_ignored(replica_client, value):
+    response = replica_client.get('/api/partners', headers={'X-DB-Primary-Until': value()})
+    assert response.headers['X-DB-Route'] == 'replica_1'
@@ -0,0 +1,36 @@
+import pytest
+from faker import Faker
+
+import seed_data
+from app import create_app
+from app.models import db, News, Player, Team
+
+from .conftest import DATASETS, TestConfig
+
+
+def seeded_rows(path, **counts):
+    """Names and titles of a database bulk-seeded from scratch"""
+    config = type('Config', (TestConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        seed_data.bulk_seed_data(**counts)
+        return (db.session.query(Team.name).order_by(Team.id).all(),
+                db.session.query(Player.first_name, Player.last_name).order_by(Player.id).all(),
+                db.session.query(News.title, News.content).order_by(News.id).all())
+
+
+def test_bulk_seeding_is_reproducible(tmp_path):
+    first = seeded_rows(tmp_path / 'first.db', **DATASETS['small'])
+    # Whatever the global Faker state was left in
+    Faker.seed(7)
+    Faker().name()
+    assert seeded_rows(tmp_path / 'second.db', **DATASETS['small']) == first
+
+
+def test_bulk_seeding_a_single_team(tmp_path):
+    counts = dict(DATASETS['small'], teams=1, matches=0)
+    teams, players, news = seeded_rows(tmp_path / 'one.db', **counts)
+    assert len(teams) == 1 and len(players) == counts['players']
+    with pytest.raises(ValueError):
+        seeded_rows(tmp_path / 'matches.db', **dict(counts, matches=1))
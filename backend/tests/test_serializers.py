@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.serializers import OrjsonProvider
+
+PAYLOAD = {'b': 1, 'a': [datetime(2024, 5, 1, 12, 30), 'é']}
+
+
+@pytest.mark.parametrize('debug', [False, True], ids=['compact', 'indented'])
+def test_responses_are_encoded_with_orjson(app, debug):
+    assert isinstance(app.json, OrjsonProvider)
+    app.debug = debug
+    try:
+        with app.app_context():
+            response = app.json.response(PAYLOAD)
+    finally:
+        app.debug = False
+    option = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if debug else 0)
+    expected = orjson.dumps({'a': ['Wed, 01 May 2024 12:30:00 GMT', 'é'], 'b': 1}, option=option)
+    assert response.get_data() == expected + b'\n'
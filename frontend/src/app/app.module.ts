@@ -1,11 +1,12 @@
 import { NgModule } from '@angular/core';
 import { BrowserModule } from '@angular/platform-browser';
-import { HttpClientModule } from '@angular/common/http';
+import { HTTP_INTERCEPTORS, HttpClientModule } from '@angular/common/http';
 import { FormsModule, ReactiveFormsModule } from '@angular/forms';
 
 import { AppRoutingModule } from './app-routing.module';
 import { AppComponent } from './app.component';
 import { PlayersComponent } from './players.component';
+import { PrimaryReadInterceptor } from './primary-read.interceptor';
 
 @NgModule({
   declarations: [
@@ -19,7 +20,9 @@ import { PlayersComponent } from './players.component';
     ReactiveFormsModule,
     PlayersComponent // Imported as a standalone component
   ],
-  providers: [],
+  providers: [
+    { provide: HTTP_INTERCEPTORS, useClass: PrimaryReadInterceptor, multi: true }
+  ],
   bootstrap: [AppComponent]
 })
 export class AppModule { }
\ No newline at end of file
@@ -2,6 +2,8 @@ import { Component, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { RouterModule } from '@angular/router';
 import { HttpClientModule } from '@angular/common/http';
+import { HomeService } from './home.service';
+import { Home } from './home.model';
 
 @Component({
   selector: 'app-home',
@@ -27,25 +29,25 @@ import { HttpClientModule } from '@angular/common/http';
       </section>
 
       <!-- Next Match Section -->
-      <section class="next-match-section mb-5">
+      <section class="next-match-section mb-5" *ngIf="home?.next_fixture as match">
         <div class="card border-0 bg-light">
           <div class="card-body">
             <h2 class="card-title text-center mb-4">Prochain Match</h2>
             <div class="row align-items-center text-center">
               <div class="col-md-5">
-                <img src="assets/logo.png" alt="ESC Logo" height="80">
-                <h4 class="mt-2">Espoir Sportif de Chorbane</h4>
+                <img [src]="match.home_team.logo_url" alt="{{ match.home_team.name }}" height="80">
+                <h4 class="mt-2">{{ match.home_team.name }}</h4>
               </div>
               <div class="col-md-2">
                 <div class="match-info">
-                  <h3 class="match-date">15 Juin 2023</h3>
-                  <p class="match-time">15:00</p>
-                  <span class="badge bg-primary">Championnat</span>
+                  <h3 class="match-date">{{ match.date | date:'d MMMM y' }}</h3>
+                  <p class="match-time">{{ match.date | date:'HH:mm' }}</p>
+                  <span class="badge bg-primary">{{ match.match_type }}</span>
                 </div>
               </div>
               <div class="col-md-5">
-                <img src="assets/opponent-logo.png" alt="Opponent Logo" height="80">
-                <h4 class="mt-2">Club Sportif Rival</h4>
+                <img [src]="match.away_team.logo_url" alt="{{ match.away_team.name }}" height="80">
+                <h4 class="mt-2">{{ match.away_team.name }}</h4>
               </div>
             </div>
             <div class="text-center mt-3">
@@ -55,40 +57,49 @@ import { HttpClientModule } from '@angular/common/http';
         </div>
       </section>
 
+      <!-- Last Results Section -->
+      <section class="last-results-section mb-5" *ngIf="home?.last_results?.length">
+        <h2 class="mb-4">Derniers Résultats</h2>
+        <ul class="list-group">
+          <li class="list-group-item d-flex justify-content-between align-items-center" *ngFor="let match of home?.last_results">
+            <span>{{ match.home_team.name }}</span>
+            <span class="badge bg-secondary">{{ match.home_score }} - {{ match.away_score }}</span>
+            <span>{{ match.away_team.name }}</span>
+          </li>
+        </ul>
+      </section>
+
+      <!-- Standings Section -->
+      <section class="standings-section mb-5" *ngIf="home?.standings?.top?.length">
+        <h2 class="mb-4">Classement {{ home?.standings?.season }}</h2>
+        <table class="table table-sm">
+          <thead>
+            <tr><th>#</th><th>Équipe</th><th>J</th><th>Diff.</th><th>Pts</th></tr>
+          </thead>
+          <tbody>
+            <tr *ngFor="let row of home?.standings?.top; let i = index">
+              <td>{{ i + 1 }}</td>
+              <td>{{ row.team.name }}</td>
+              <td>{{ row.played }}</td>
+              <td>{{ row.goal_difference }}</td>
+              <td><strong>{{ row.points }}</strong></td>
+            </tr>
+          </tbody>
+        </table>
+      </section>
+
       <!-- Latest News Section -->
       <section class="latest-news-section mb-5">
         <h2 class="mb-4">Dernières Actualités</h2>
         <div class="row">
-          <div class="col-md-4 mb-4">
-            <div class="card h-100">
-              <img src="assets/news1.jpg" class="card-img-top" alt="Actualité 1">
-              <div class="card-body">
-                <h5 class="card-title">Victoire éclatante contre l'équipe rivale</h5>
-                <p class="card-text">L'ESC a remporté une victoire impressionnante 3-0 lors du dernier match à domicile.</p>
-                <p class="text-muted">10 juin 2023</p>
-                <a href="#" class="btn btn-sm btn-primary">Lire plus</a>
-              </div>
-            </div>
-          </div>
-          <div class="col-md-4 mb-4">
-            <div class="card h-100">
-              <img src="assets/news2.jpg" class="card-img-top" alt="Actualité 2">
-              <div class="card-body">
-                <h5 class="card-title">Nouveau joueur rejoint l'équipe</h5>
-                <p class="card-text">L'attaquant prometteur Ahmed Ben Mohamed a signé un contrat de 3 ans avec l'ESC.</p>
-                <p class="text-muted">5 juin 2023</p>
-                <a href="#" class="btn btn-sm btn-primary">Lire plus</a>
-              </div>
-            </div>
-          </div>
-          <div class="col-md-4 mb-4">
+          <div class="col-md-4 mb-4" *ngFor="let news of home?.news">
             <div class="card h-100">
-              <img src="assets/news3.jpg" class="card-img-top" alt="Actualité 3">
+              <img *ngIf="news.image_url" [src]="news.image_url" class="card-img-top" alt="{{ news.title }}">
               <div class="card-body">
-                <h5 class="card-title">Rénovation du stade municipal</h5>
-                <p class="card-text">Les travaux de rénovation du stade municipal de Chorbane ont commencé cette semaine.</p>
-                <p class="text-muted">1 juin 2023</p>
-                <a href="#" class="btn btn-sm btn-primary">Lire plus</a>
+                <h5 class="card-title">{{ news.title }}</h5>
+                <p class="card-text">{{ news.excerpt }}</p>
+                <p class="text-muted">{{ news.published_date | date:'d MMMM y' }}</p>
+                <a routerLink="/actualites" class="btn btn-sm btn-primary">Lire plus</a>
               </div>
             </div>
           </div>
@@ -121,9 +132,12 @@ import { HttpClientModule } from '@angular/common/http';
       <!-- Partners Section -->
       <section class="partners-section mb-5">
         <h2 class="mb-4">Nos Partenaires</h2>
-        <div class="row align-items-center">
-          <div class="col-6 col-md-2 mb-4 text-center" *ngFor="let partner of partners">
-            <img [src]="partner.logo_url" alt="{{ partner.name }}" class="img-fluid partner-logo">
+        <div *ngFor="let group of home?.partners">
+          <h5 class="text-uppercase text-muted">{{ group.level }}</h5>
+          <div class="row align-items-center">
+            <div class="col-6 col-md-2 mb-4 text-center" *ngFor="let partner of group.partners">
+              <img [src]="partner.logo_url" alt="{{ partner.name }}" class="img-fluid partner-logo">
+            </div>
           </div>
         </div>
         <div class="text-center mt-3">
@@ -189,22 +203,19 @@ export class HomeComponent implements OnInit {
     }
   ];
 
-  partners = [
-    { id: 1, name: 'Sponsor 1', logo_url: 'assets/sponsor1.png' },
-    { id: 2, name: 'Sponsor 2', logo_url: 'assets/sponsor2.png' },
-    { id: 3, name: 'Sponsor 3', logo_url: 'assets/sponsor3.png' },
-    { id: 4, name: 'Sponsor 4', logo_url: 'assets/sponsor4.png' },
-    { id: 5, name: 'Sponsor 5', logo_url: 'assets/sponsor5.png' },
-    { id: 6, name: 'Sponsor 6', logo_url: 'assets/sponsor6.png' }
-  ];
+  // Homepage sections, loaded in one request
+  home?: Home;
 
-  constructor() { }
+  constructor(private homeService: HomeService) { }
 
   ngOnInit(): void {
-    // In a real application, we would fetch this data from the API
-    // For example:
-    // this.playerService.getPlayers().subscribe(players => {
-    //   this.featuredPlayers = players.slice(0, 4);
-    // });
+    this.homeService.getHome().subscribe(
+      (data) => {
+        this.home = data;
+      },
+      (error) => {
+        console.error('Error loading homepage:', error);
+      }
+    );
   }
 }
\ No newline at end of file
@@ -0,0 +1,84 @@
+/**
+ * Interface for a team as summarized on the homepage
+ */
+export interface TeamSummary {
+  id: number;
+  name: string;
+  logo_url?: string;
+}
+
+/**
+ * Interface for a news teaser (excerpt instead of the full content)
+ */
+export interface NewsExcerpt {
+  id: number;
+  title: string;
+  image_url?: string;
+  published_date?: string;
+  category?: string;
+  excerpt: string;
+}
+
+/**
+ * Interface for a fixture or result
+ */
+export interface MatchSummary {
+  id: number;
+  date: string;
+  home_team_id: number;
+  away_team_id: number;
+  home_score?: number;
+  away_score?: number;
+  venue?: string;
+  match_type?: string;
+  season?: string;
+  status: 'upcoming' | 'played' | 'cancelled';
+  home_team: TeamSummary;
+  away_team: TeamSummary;
+}
+
+/**
+ * Interface for a league table row
+ */
+export interface StandingRow {
+  season: string;
+  team_id: number;
+  played: number;
+  won: number;
+  drawn: number;
+  lost: number;
+  goals_for: number;
+  goals_against: number;
+  goal_difference: number;
+  points: number;
+  form: string;
+  team: TeamSummary;
+}
+
+/**
+ * Interface for the partners of one partnership level
+ */
+export interface PartnerGroup {
+  level: string;
+  partners: {
+    id: number;
+    name: string;
+    logo_url?: string;
+    website_url?: string;
+    partnership_level?: string;
+  }[];
+}
+
+/**
+ * Interface for the aggregated homepage response (GET /home)
+ */
+export interface Home {
+  news: NewsExcerpt[];
+  next_fixture: MatchSummary | null;
+  last_results: MatchSummary[];
+  standings: {
+    season: string | null;
+    top: StandingRow[];
+  };
+  partners: PartnerGroup[];
+}
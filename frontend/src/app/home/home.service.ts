@@ -0,0 +1,22 @@
+import { Injectable } from '@angular/core';
+import { HttpClient } from '@angular/common/http';
+import { Observable } from 'rxjs';
+import { Home } from './home.model';
+import { environment } from '../../environments/environment';
+
+@Injectable({
+  providedIn: 'root'
+})
+export class HomeService {
+  private apiUrl = `${environment.apiUrl}/home`;
+
+  constructor(private http: HttpClient) { }
+
+  /**
+   * Get every homepage section in one request
+   * @returns Observable of the news teasers, fixtures, standings and partners
+   */
+  getHome(): Observable<Home> {
+    return this.http.get<Home>(this.apiUrl);
+  }
+}
@@ -35,4 +35,25 @@ export interface PlayerMatchStats {
   yellow_cards: number;
   red_cards: number;
   minutes_played: number;
+}
+
+/**
+ * Interface for a keyset-paginated list response
+ */
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+  limit: number;
+}
+
+/**
+ * Interface for a delta sync response (rows changed since a watermark)
+ */
+export interface SyncPage<T> {
+  items: T[];
+  deleted: number[];
+  reset: boolean;
+  watermark: string;
+  next_cursor: string | null;
+  limit: number;
 }
\ No newline at end of file
@@ -1,7 +1,8 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
-import { Observable } from 'rxjs';
-import { Player } from './player.model';
+import { EMPTY, Observable } from 'rxjs';
+import { expand, map, reduce } from 'rxjs/operators';
+import { Page, Player, SyncPage } from './player.model';
 import { environment } from '../environments/environment';
 
 @Injectable({
@@ -9,16 +10,76 @@ import { environment } from '../environments/environment';
 })
 export class PlayerService {
   private apiUrl = `${environment.apiUrl}/players`;
+  private syncUrl = `${environment.apiUrl}/sync/players`;
+  
+  // Players synced so far and the watermark to ask for changes from
+  private roster = new Map<number, Player>();
+  private watermark?: string;
 
   constructor(private http: HttpClient) { }
 
+  /**
+   * Get every player, downloading only what changed since the previous call
+   * @returns Observable of the Player array, kept in memory between navigations
+   */
+  syncPlayers(): Observable<Player[]> {
+    return this.getPlayerChanges(this.watermark).pipe(
+      expand(page => page.next_cursor ? this.getPlayerChanges(undefined, page.next_cursor) : EMPTY),
+      reduce((pages, page) => [...pages, page], [] as SyncPage<Player>[]),
+      map(pages => {
+        if (pages[0].reset) {
+          this.roster.clear();
+        }
+        
+        pages.forEach(page => {
+          page.items.forEach(player => this.roster.set(player.id!, player));
+          page.deleted.forEach(id => this.roster.delete(id));
+        });
+        this.watermark = pages[0].watermark;
+        
+        return Array.from(this.roster.values());
+      })
+    );
+  }
+
+  /**
+   * Get one page of the players changed since a watermark
+   * @param since Optional watermark returned by the previous sync (none: every player)
+   * @param cursor Optional cursor returned as next_cursor by the previous page
+   * @returns Observable of a sync page
+   */
+  getPlayerChanges(since?: string, cursor?: string): Observable<SyncPage<Player>> {
+    let params = new HttpParams();
+    
+    if (since) {
+      params = params.set('since', since);
+    }
+    
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    
+    return this.http.get<SyncPage<Player>>(this.syncUrl, { params });
+  }
+
   /**
    * Get all players with optional filtering
    * @param category Optional category filter
    * @param teamId Optional team ID filter
-   * @returns Observable of Player array
+   * @returns Observable of Player array (first page)
    */
   getPlayers(category?: string, teamId?: number): Observable<Player[]> {
+    return this.getPlayersPage(category, teamId).pipe(map(page => page.items));
+  }
+
+  /**
+   * Get one page of players
+   * @param category Optional category filter
+   * @param teamId Optional team ID filter
+   * @param cursor Optional cursor returned as next_cursor by the previous page
+   * @returns Observable of a Player page
+   */
+  getPlayersPage(category?: string, teamId?: number, cursor?: string): Observable<Page<Player>> {
     let params = new HttpParams();
     
     if (category) {
@@ -29,7 +90,11 @@ export class PlayerService {
       params = params.set('team_id', teamId.toString());
     }
     
-    return this.http.get<Player[]>(this.apiUrl, { params });
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    
+    return this.http.get<Page<Player>>(this.apiUrl, { params });
   }
 
   /**
@@ -303,9 +303,10 @@ export class PlayersComponent implements OnInit {
   }
   
   loadPlayers(): void {
-    this.playerService.getPlayers(this.selectedCategory).subscribe(
+    // Only the players changed since the last load are downloaded; filter locally
+    this.playerService.syncPlayers().subscribe(
       (data) => {
-        this.players = data;
+        this.players = this.selectedCategory ? data.filter(player => player.category === this.selectedCategory) : data;
       },
       (error) => {
         console.error('Error loading players:', error);
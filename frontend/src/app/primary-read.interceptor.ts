@@ -0,0 +1,37 @@
+import { Injectable } from '@angular/core';
+import { HttpEvent, HttpHandler, HttpInterceptor, HttpRequest, HttpResponse } from '@angular/common/http';
+import { Observable } from 'rxjs';
+import { tap } from 'rxjs/operators';
+import { environment } from '../environments/environment';
+
+// Set by the API after a write: until then, reads must go to the primary database.
+// The value is '<end of the window in epoch ms>.<signature>' and is sent back as is.
+const PRIMARY_UNTIL_HEADER = 'X-DB-Primary-Until';
+
+@Injectable()
+export class PrimaryReadInterceptor implements HttpInterceptor {
+  private primaryUntil?: string;
+
+  /**
+   * Send back the read-your-writes window of the last write, so that the
+   * next reads see it instead of a lagging replica
+   */
+  intercept(request: HttpRequest<unknown>, next: HttpHandler): Observable<HttpEvent<unknown>> {
+    if (!request.url.startsWith(environment.apiUrl)) {
+      return next.handle(request);
+    }
+    
+    if (this.primaryUntil && Number(this.primaryUntil.split('.')[0]) > Date.now()) {
+      request = request.clone({ setHeaders: { [PRIMARY_UNTIL_HEADER]: this.primaryUntil } });
+    }
+    
+    return next.handle(request).pipe(
+      tap(event => {
+        const until = event instanceof HttpResponse ? event.headers.get(PRIMARY_UNTIL_HEADER) : null;
+        if (until) {
+          this.primaryUntil = until;
+        }
+      })
+    );
+  }
+}